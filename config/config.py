@@ -1,170 +1,333 @@
 import os
-from typing import Dict, Any
-from dotenv import load_dotenv
-from pathlib import Path
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Set, Tuple
 
-load_dotenv()
+from config.envs import ensure_env_loaded
 
+
+def _str(value: Optional[str]) -> Optional[str]:
+    return value
+
+
+def _bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+def _cast(name: str, value: Optional[str], caster: Callable[[Any], Any]) -> Any:
+    """Cast nilai environment variable, dengan error yang menyebutkan nama variable"""
+    try:
+        return caster(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid value for {name}: {value!r}") from e
+
+
+# (NAME, default, caster) - nama field Config adalah NAME dalam lowercase
+_SPEC: Tuple[Tuple[str, Optional[str], Callable[[Any], Any]], ...] = (
+    # Database Configuration
+    ("MYSQL_HOST", "localhost", _str),
+    ("MYSQL_PORT", "3306", int),
+    ("MYSQL_USER", "root", _str),
+    ("MYSQL_PASSWORD", "", _str),
+    ("MYSQL_DATABASE", "rag_orchestra", _str),
+    ("MONGODB_URL", "mongodb://localhost:27017/", _str),
+    ("MONGODB_DATABASE", "rag_orchestra", _str),
+
+    # Redis Configuration
+    ("REDIS_HOST", "localhost", _str),
+    ("REDIS_PORT", "6379", int),
+    ("REDIS_PASSWORD", "", _str),
+
+    # Vector Database
+    ("CHROMA_PERSIST_DIRECTORY", "./vector_db", _str),
+
+    # LLM Configuration
+    ("GEMINI_API_KEY", None, _str),
+    ("OPENAI_API_KEY", None, _str),
+    ("ANTHROPIC_API_KEY", None, _str),
+
+    # Default LLM Models
+    ("DEFAULT_GEMINI_MODEL", "gemini-1.5-flash", _str),
+    ("DEFAULT_OPENAI_MODEL", "gpt-4", _str),
+
+    # Application Settings
+    ("LOG_LEVEL", "INFO", _str),
+    ("MAX_RETRIES", "3", int),
+    ("TIMEOUT_SECONDS", "30", int),
+
+    # Environment
+    ("ENVIRONMENT", "development", _str),
+    ("DEBUG", "true", _bool),
+
+    # Security
+    ("SECRET_KEY", "your-secret-key-change-in-production", _str),
+    ("ACCESS_TOKEN_EXPIRE_MINUTES", "30", int),
+
+    # Data Paths
+    ("DATA_CP_PATH", "data/cp", _str),
+    ("DATA_ATP_PATH", "data/atp", _str),
+    ("DATA_MODUL_AJAR_PATH", "data/modul_ajar", _str),
+
+    # Upload & Output Paths
+    ("UPLOAD_PATH", "uploads", _str),
+    ("OUTPUT_PATH", "outputs", _str),
+
+    # WebSocket Configuration
+    ("WEBSOCKET_HOST", "0.0.0.0", _str),
+    ("WEBSOCKET_PORT", "8000", int),
+
+    # Online Search Configuration
+    ("SEARCH_MAX_RESULTS", "5", int),
+    ("SEARCH_TIMEOUT", "10", int),
+    ("SEARCH_RETRIES", "3", int),
+
+    # Content Processing
+    ("MAX_CONTENT_LENGTH", "3000", int),
+    ("MIN_CP_LENGTH", "100", int),
+    ("MIN_ATP_LENGTH", "150", int),
+)
+
+class OrchestratorThresholds(NamedTuple):
+    """Thresholds untuk pemilihan strategi RAG"""
+    simple_rag: float
+    advanced_rag: float
+    graph_rag: float
+    overall_confidence: float
+
+
+class TemplateMatchingWeights(NamedTuple):
+    """Weights untuk template matching score"""
+    lambda_1: float
+    lambda_2: float
+
+
+class AdvancedRAGWeights(NamedTuple):
+    """Weights untuk Advanced RAG score"""
+    alpha_1: float
+    alpha_2: float
+    alpha_3: float
+    alpha_4: float
+
+
+class GraphRAGWeights(NamedTuple):
+    """Weights untuk Graph RAG score"""
+    beta_1: float
+    beta_2: float
+    beta_3: float
+
+
+class OrchestratorWeights(NamedTuple):
+    """Weights untuk scoring calculations, per group"""
+    template_matching: TemplateMatchingWeights
+    advanced_rag: AdvancedRAGWeights
+    graph_rag: GraphRAGWeights
+
+
+# Thresholds berdasarkan pilot test dan literatur: (key, NAME, default)
+_THRESHOLD_SPEC = (
+    ("simple_rag", "SIMPLE_RAG_THRESHOLD", "0.85"),
+    ("advanced_rag", "ADVANCED_RAG_THRESHOLD", "0.6"),
+    ("graph_rag", "GRAPH_RAG_THRESHOLD", "0.5"),
+    ("overall_confidence", "OVERALL_CONFIDENCE_THRESHOLD", "0.8"),
+)
+
+# Weights untuk scoring calculations: group -> (NamedTuple, (key, NAME, default))
+_WEIGHT_SPEC = {
+    "template_matching": (TemplateMatchingWeights, (
+        ("lambda_1", "TEMPLATE_LAMBDA_1", "0.8"),
+        ("lambda_2", "TEMPLATE_LAMBDA_2", "0.2"),
+    )),
+    "advanced_rag": (AdvancedRAGWeights, (
+        ("alpha_1", "ADVANCED_ALPHA_1", "0.3"),
+        ("alpha_2", "ADVANCED_ALPHA_2", "0.25"),
+        ("alpha_3", "ADVANCED_ALPHA_3", "0.25"),
+        ("alpha_4", "ADVANCED_ALPHA_4", "0.2"),
+    )),
+    "graph_rag": (GraphRAGWeights, (
+        ("beta_1", "GRAPH_BETA_1", "0.4"),
+        ("beta_2", "GRAPH_BETA_2", "0.4"),
+        ("beta_3", "GRAPH_BETA_3", "0.2"),
+    )),
+}
+
+# Directory yang sudah dipastikan ada oleh ensure_directories()
+_ensured_directories: Set[str] = set()
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
     """
     Configuration class untuk RAG Orchestra System
     Updated sesuai instruksi Orchestrated RAG terbaru
+
+    Dibangun sekali dari environment melalui get_config()
     """
 
     # Database Configuration
-    MYSQL_HOST = os.getenv("MYSQL_HOST", "localhost")
-    MYSQL_PORT = int(os.getenv("MYSQL_PORT", "3306"))
-    MYSQL_USER = os.getenv("MYSQL_USER", "root")
-    MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
-    MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "rag_orchestra")
+    mysql_host: str
+    mysql_port: int
+    mysql_user: str
+    mysql_password: str
+    mysql_database: str
 
-    MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
-    MONGODB_DATABASE = os.getenv("MONGODB_DATABASE", "rag_orchestra")
+    mongodb_url: str
+    mongodb_database: str
 
     # Redis Configuration
-    REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")
+    redis_host: str
+    redis_port: int
+    redis_password: str
 
     # Vector Database
-    CHROMA_PERSIST_DIRECTORY = os.getenv("CHROMA_PERSIST_DIRECTORY", "./vector_db")
+    chroma_persist_directory: str
 
     # LLM Configuration
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+    gemini_api_key: Optional[str]
+    openai_api_key: Optional[str]
+    anthropic_api_key: Optional[str]
 
     # Default LLM Models
-    DEFAULT_GEMINI_MODEL = os.getenv("DEFAULT_GEMINI_MODEL", "gemini-1.5-flash")
-    DEFAULT_OPENAI_MODEL = os.getenv("DEFAULT_OPENAI_MODEL", "gpt-4")
+    default_gemini_model: str
+    default_openai_model: str
 
     # Application Settings
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-    TIMEOUT_SECONDS = int(os.getenv("TIMEOUT_SECONDS", "30"))
+    log_level: str
+    max_retries: int
+    timeout_seconds: int
 
     # Environment
-    ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
-    DEBUG = os.getenv("DEBUG", "true").lower() == "true"
+    environment: str
+    debug: bool
 
     # Security
-    SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    secret_key: str
+    access_token_expire_minutes: int
 
     # Data Paths
-    DATA_CP_PATH = os.getenv("DATA_CP_PATH", "data/cp")
-    DATA_ATP_PATH = os.getenv("DATA_ATP_PATH", "data/atp")
-    DATA_MODUL_AJAR_PATH = os.getenv("DATA_MODUL_AJAR_PATH", "data/modul_ajar")
+    data_cp_path: str
+    data_atp_path: str
+    data_modul_ajar_path: str
 
     # Upload & Output Paths
-    UPLOAD_PATH = os.getenv("UPLOAD_PATH", "uploads")
-    OUTPUT_PATH = os.getenv("OUTPUT_PATH", "outputs")
+    upload_path: str
+    output_path: str
 
     # WebSocket Configuration
-    WEBSOCKET_HOST = os.getenv("WEBSOCKET_HOST", "0.0.0.0")
-    WEBSOCKET_PORT = int(os.getenv("WEBSOCKET_PORT", "8000"))
+    websocket_host: str
+    websocket_port: int
 
     # Orchestrator Configuration
     # Thresholds berdasarkan pilot test dan literatur
-    ORCHESTRATOR_THRESHOLDS = {
-        "simple_rag": float(os.getenv("SIMPLE_RAG_THRESHOLD", "0.85")),
-        "advanced_rag": float(os.getenv("ADVANCED_RAG_THRESHOLD", "0.6")),
-        "graph_rag": float(os.getenv("GRAPH_RAG_THRESHOLD", "0.5")),
-        "overall_confidence": float(os.getenv("OVERALL_CONFIDENCE_THRESHOLD", "0.8"))
-    }
+    orchestrator_thresholds: OrchestratorThresholds
 
     # Weights untuk scoring calculations
-    ORCHESTRATOR_WEIGHTS = {
-        "template_matching": {
-            "lambda_1": float(os.getenv("TEMPLATE_LAMBDA_1", "0.8")),
-            "lambda_2": float(os.getenv("TEMPLATE_LAMBDA_2", "0.2"))
-        },
-        "advanced_rag": {
-            "alpha_1": float(os.getenv("ADVANCED_ALPHA_1", "0.3")),
-            "alpha_2": float(os.getenv("ADVANCED_ALPHA_2", "0.25")),
-            "alpha_3": float(os.getenv("ADVANCED_ALPHA_3", "0.25")),
-            "alpha_4": float(os.getenv("ADVANCED_ALPHA_4", "0.2"))
-        },
-        "graph_rag": {
-            "beta_1": float(os.getenv("GRAPH_BETA_1", "0.4")),
-            "beta_2": float(os.getenv("GRAPH_BETA_2", "0.4")),
-            "beta_3": float(os.getenv("GRAPH_BETA_3", "0.2"))
-        }
-    }
+    orchestrator_weights: OrchestratorWeights
 
     # Online Search Configuration
-    SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "5"))
-    SEARCH_TIMEOUT = int(os.getenv("SEARCH_TIMEOUT", "10"))
-    SEARCH_RETRIES = int(os.getenv("SEARCH_RETRIES", "3"))
+    search_max_results: int
+    search_timeout: int
+    search_retries: int
 
     # Content Processing
-    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", "3000"))
-    MIN_CP_LENGTH = int(os.getenv("MIN_CP_LENGTH", "100"))
-    MIN_ATP_LENGTH = int(os.getenv("MIN_ATP_LENGTH", "150"))
+    max_content_length: int
+    min_cp_length: int
+    min_atp_length: int
+
+    # Summary read-only, dibangun sekali oleh get_config_summary()
+    _summary: Optional[Mapping[str, Any]] = field(default=None, init=False, repr=False, compare=False)
 
     @classmethod
-    def ensure_directories(cls):
-        """Ensure semua directory yang diperlukan ada"""
+    def _from_env(cls) -> "Config":
+        """Build configuration dari environment variables"""
+        ensure_env_loaded()
+        env = os.environ
+        values = {
+            name.lower(): _cast(name, env.get(name, default), caster)
+            for name, default, caster in _SPEC
+        }
+        values["orchestrator_thresholds"] = OrchestratorThresholds(**{
+            key: _cast(name, env.get(name, default), float)
+            for key, name, default in _THRESHOLD_SPEC
+        })
+        values["orchestrator_weights"] = OrchestratorWeights(**{
+            group: weights_cls(**{
+                key: _cast(name, env.get(name, default), float)
+                for key, name, default in spec
+            })
+            for group, (weights_cls, spec) in _WEIGHT_SPEC.items()
+        })
+        return cls(**values)
+
+    def ensure_directories(self):
+        """Ensure semua directory yang diperlukan ada (mkdir hanya sekali per proses)"""
         directories = [
-            cls.DATA_CP_PATH,
-            cls.DATA_ATP_PATH,
-            cls.DATA_MODUL_AJAR_PATH,
-            cls.CHROMA_PERSIST_DIRECTORY,
-            cls.UPLOAD_PATH,
-            cls.OUTPUT_PATH,
+            self.data_cp_path,
+            self.data_atp_path,
+            self.data_modul_ajar_path,
+            self.chroma_persist_directory,
+            self.upload_path,
+            self.output_path,
             "logs"
         ]
 
         for directory in directories:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+            if directory in _ensured_directories:
+                continue
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
+            _ensured_directories.add(directory)
 
-    @classmethod
-    def validate_config(cls) -> Dict[str, bool]:
-        """Validate configuration"""
+    def validate_config(self) -> Dict[str, bool]:
+        """
+        Validate runtime configuration
+
+        Thresholds dan weights divalidasi saat pre-commit oleh tools/validate_config.py
+        """
         validation_results = {}
 
         # Check required API keys
-        validation_results["has_gemini_key"] = bool(cls.GEMINI_API_KEY)
-        validation_results["has_openai_key"] = bool(cls.OPENAI_API_KEY)
+        validation_results["has_gemini_key"] = bool(self.gemini_api_key)
+        validation_results["has_openai_key"] = bool(self.openai_api_key)
         validation_results["has_any_llm_key"] = validation_results["has_gemini_key"] or validation_results["has_openai_key"]
 
         # Check directory access
         try:
-            cls.ensure_directories()
+            self.ensure_directories()
             validation_results["directories_accessible"] = True
         except Exception:
             validation_results["directories_accessible"] = False
 
-        # Check threshold values
-        thresholds_valid = all(
-            0.0 <= threshold <= 1.0
-            for threshold in cls.ORCHESTRATOR_THRESHOLDS.values()
-        )
-        validation_results["thresholds_valid"] = thresholds_valid
-
         return validation_results
 
-    @classmethod
-    def get_config_summary(cls) -> Dict[str, Any]:
-        """Get configuration summary"""
-        return {
-            "environment": cls.ENVIRONMENT,
-            "debug": cls.DEBUG,
-            "llm_models": {
-                "gemini_available": bool(cls.GEMINI_API_KEY),
-                "openai_available": bool(cls.OPENAI_API_KEY),
-                "default_gemini": cls.DEFAULT_GEMINI_MODEL,
-                "default_openai": cls.DEFAULT_OPENAI_MODEL
-            },
-            "thresholds": cls.ORCHESTRATOR_THRESHOLDS,
-            "websocket": {
-                "host": cls.WEBSOCKET_HOST,
-                "port": cls.WEBSOCKET_PORT
-            },
-            "data_paths": {
-                "cp": cls.DATA_CP_PATH,
-                "atp": cls.DATA_ATP_PATH,
-                "modul_ajar": cls.DATA_MODUL_AJAR_PATH,
-                "vector_db": cls.CHROMA_PERSIST_DIRECTORY
-            }
-        }
+    def get_config_summary(self) -> Mapping[str, Any]:
+        """Get configuration summary (read-only, dibangun sekali karena Config immutable)"""
+        if self._summary is None:
+            object.__setattr__(self, "_summary", MappingProxyType({
+                "environment": self.environment,
+                "debug": self.debug,
+                "llm_models": MappingProxyType({
+                    "gemini_available": bool(self.gemini_api_key),
+                    "openai_available": bool(self.openai_api_key),
+                    "default_gemini": self.default_gemini_model,
+                    "default_openai": self.default_openai_model
+                }),
+                "thresholds": MappingProxyType(self.orchestrator_thresholds._asdict()),
+                "websocket": MappingProxyType({
+                    "host": self.websocket_host,
+                    "port": self.websocket_port
+                }),
+                "data_paths": MappingProxyType({
+                    "cp": self.data_cp_path,
+                    "atp": self.data_atp_path,
+                    "modul_ajar": self.data_modul_ajar_path,
+                    "vector_db": self.chroma_persist_directory
+                })
+            }))
+        return self._summary
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Get configuration instance (dibangun sekali per proses)"""
+    return Config._from_env()
@@ -0,0 +1,101 @@
+"""
+Environment Variables Registry
+==============================
+
+Registry terpusat untuk environment variables yang dibaca runtime
+(database layer). Setiap variable di-parse lazily saat pertama diakses
+dan hasilnya di-cache, sehingga os.getenv + cast hanya terjadi sekali.
+
+Usage:
+    from config import envs
+    envs.DATABASE_POOL_SIZE
+"""
+
+import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    MYSQL_HOST: str = "if.unismuh.ac.id"
+    MYSQL_PORT: int = 3388
+    MYSQL_USER: str = "root"
+    MYSQL_PASSWORD: str = "mariabelajar"
+    MYSQL_DATABASE: str = "rag_multi_strategy"
+    MONGODB_URL: str = "mongodb://localhost:27017/"
+    MONGODB_DATABASE: str = "rag_multi_strategy"
+    DATABASE_URL: Optional[str] = None
+    DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 20
+    DATABASE_MAX_OVERFLOW: int = 30
+    DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_PASSWORD: Optional[str] = None
+    REDIS_SOCKET_TIMEOUT: int = 5
+    REDIS_MAX_CONNECTIONS: int = 50
+    CORS_ORIGINS: Tuple[str, ...] = ("*",)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400
+    LLM_CACHE_SIMILARITY: float = 0.9
+
+
+@lru_cache(maxsize=1)
+def ensure_env_loaded() -> bool:
+    """Load .env sekali per proses"""
+    load_dotenv()
+    return True
+
+
+environment_variables: Dict[str, Callable[[], Any]] = {
+    # MySQL Configuration
+    "MYSQL_HOST": lambda: os.getenv("MYSQL_HOST", "if.unismuh.ac.id"),
+    "MYSQL_PORT": lambda: int(os.getenv("MYSQL_PORT", "3388")),
+    "MYSQL_USER": lambda: os.getenv("MYSQL_USER", "root"),
+    "MYSQL_PASSWORD": lambda: os.getenv("MYSQL_PASSWORD", "mariabelajar"),
+    "MYSQL_DATABASE": lambda: os.getenv("MYSQL_DATABASE", "rag_multi_strategy"),
+
+    # MongoDB Configuration
+    "MONGODB_URL": lambda: os.getenv("MONGODB_URL", "mongodb://localhost:27017/"),
+    "MONGODB_DATABASE": lambda: os.getenv("MONGODB_DATABASE", "rag_multi_strategy"),
+
+    # SQLAlchemy Configuration (DATABASE_URL default dibangun oleh DatabaseConfig)
+    "DATABASE_URL": lambda: os.getenv("DATABASE_URL"),
+    "DATABASE_ECHO": lambda: os.getenv("DATABASE_ECHO", "false").lower() == "true",
+    "DATABASE_POOL_SIZE": lambda: int(os.getenv("DATABASE_POOL_SIZE", "20")),
+    "DATABASE_MAX_OVERFLOW": lambda: int(os.getenv("DATABASE_MAX_OVERFLOW", "30")),
+    "DATABASE_POOL_TIMEOUT": lambda: int(os.getenv("DATABASE_POOL_TIMEOUT", "30")),
+    # Recycle di bawah MySQL wait_timeout agar koneksi stale tidak dipakai ulang
+    "DATABASE_POOL_RECYCLE": lambda: int(os.getenv("DATABASE_POOL_RECYCLE", "1800")),
+
+    # Redis Configuration
+    "REDIS_URL": lambda: os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    "REDIS_PASSWORD": lambda: os.getenv("REDIS_PASSWORD", None),
+    "REDIS_SOCKET_TIMEOUT": lambda: int(os.getenv("REDIS_SOCKET_TIMEOUT", "5")),
+    "REDIS_MAX_CONNECTIONS": lambda: int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+    # CORS allowlist, dipisah koma; "*" mengizinkan semua origin
+    "CORS_ORIGINS": lambda: tuple(os.getenv("CORS_ORIGINS", "*").split(",")),
+
+    # Cache response LLM untuk generasi CP/ATP
+    "LLM_CACHE_ENABLED": lambda: os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+    "LLM_CACHE_TTL": lambda: int(os.getenv("LLM_CACHE_TTL", "86400")),
+    "LLM_CACHE_SIMILARITY": lambda: float(os.getenv("LLM_CACHE_SIMILARITY", "0.9")),
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve(name: str) -> Any:
+    """Parse environment variable sekali, lalu cache hasilnya"""
+    ensure_env_loaded()
+    return environment_variables[name]()
+
+
+def __getattr__(name: str) -> Any:
+    if name in environment_variables:
+        return _resolve(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return list(environment_variables.keys())
@@ -7,10 +7,9 @@ Script untuk initialize database tables dan setup awal
 
 import sys
 import os
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent))
+from sqlalchemy import inspect, text
 
 from src.utils.database import db_config, Base
 from src.utils.models import *
@@ -25,16 +24,15 @@ def create_database_tables():
 
         # Test connection first
         engine = db_config.engine
-        connection = engine.connect()
-        logger.info("Database connection successful")
-        connection.close()
+        with engine.connect():
+            logger.info("Database connection successful")
 
         # Create all tables
         Base.metadata.create_all(bind=engine)
         logger.success("All database tables created successfully")
 
         # Print table information
-        inspector = engine.dialect.get_inspector(engine)
+        inspector = inspect(engine)
         table_names = inspector.get_table_names()
 
         logger.info(f"Created {len(table_names)} tables:")
@@ -47,42 +45,58 @@ def create_database_tables():
         logger.error(f"Error creating database tables: {str(e)}")
         return False
 
-def test_database_connection():
-    """Test database connections"""
-    logger.info("Testing database connections...")
-
-    # Test MySQL connection
+def _probe_mysql():
+    """Probe MySQL connection"""
     try:
         engine = db_config.engine
-        connection = engine.connect()
-        result = connection.execute("SELECT 1")
-        logger.success("✓ MySQL connection successful")
-        connection.close()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return "MySQL", True, None
     except Exception as e:
-        logger.error(f"✗ MySQL connection failed: {str(e)}")
-        return False
+        return "MySQL", False, str(e)
 
-    # Test MongoDB connection
+def _probe_mongo():
+    """Probe MongoDB connection"""
     try:
-        if db_config.mongo_client:
-            db_config.mongo_client.admin.command('ping')
-            logger.success("✓ MongoDB connection successful")
-        else:
-            logger.warning("⚠ MongoDB client not initialized")
+        if not db_config.mongo_client:
+            return "MongoDB", False, None
+        db_config.mongo_client.admin.command('ping')
+        return "MongoDB", True, None
     except Exception as e:
-        logger.warning(f"⚠ MongoDB connection failed: {str(e)}")
+        return "MongoDB", False, str(e)
 
-    # Test Redis connection
+def _probe_redis():
+    """Probe Redis connection"""
     try:
-        if db_config.redis_client:
-            db_config.redis_client.ping()
-            logger.success("✓ Redis connection successful")
-        else:
-            logger.warning("⚠ Redis client not initialized")
+        if not db_config.redis_client:
+            return "Redis", False, None
+        db_config.redis_client.ping()
+        return "Redis", True, None
     except Exception as e:
-        logger.warning(f"⚠ Redis connection failed: {str(e)}")
+        return "Redis", False, str(e)
+
+def test_database_connection():
+    """Test database connections"""
+    logger.info("Testing database connections...")
 
-    return True
+    # Probe semua database secara paralel (I/O-bound, client independen)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results = list(executor.map(lambda probe: probe(), [_probe_mysql, _probe_mongo, _probe_redis]))
+
+    mysql_ok = True
+    for name, ok, error in results:
+        if ok:
+            logger.success(f"✓ {name} connection successful")
+        elif name == "MySQL":
+            # MySQL adalah database utama, kegagalan menggagalkan test
+            logger.error(f"✗ {name} connection failed: {error}")
+            mysql_ok = False
+        elif error is None:
+            logger.warning(f"⚠ {name} client not initialized")
+        else:
+            logger.warning(f"⚠ {name} connection failed: {error}")
+
+    return mysql_ok
 
 def show_database_info():
     """Show database configuration info"""
@@ -93,35 +107,61 @@ def show_database_info():
     logger.info(f"MongoDB Database: {db_config.mongodb_database}")
     logger.info(f"Redis URL: {db_config.redis_url}")
 
-def main():
-    """Main function"""
-    import argparse
+def _run_test():
+    """Run connection test, exit jika gagal"""
+    if not test_database_connection():
+        logger.error("Database connection test failed")
+        sys.exit(1)
 
-    parser = argparse.ArgumentParser(description="Database Initialization")
-    parser.add_argument("--test", action="store_true", help="Test database connections")
-    parser.add_argument("--create", action="store_true", help="Create database tables")
-    parser.add_argument("--info", action="store_true", help="Show database info")
-    parser.add_argument("--all", action="store_true", help="Run all operations")
+def _run_create():
+    """Run table creation, exit jika gagal"""
+    if not create_database_tables():
+        logger.error("Database table creation failed")
+        sys.exit(1)
 
-    args = parser.parse_args()
+# Urutan dict menentukan urutan eksekusi
+ACTIONS = {
+    "--info": show_database_info,
+    "--test": _run_test,
+    "--create": _run_create,
+}
 
-    if args.all or args.info:
-        show_database_info()
+USAGE = """usage: init_database.py [--info] [--test] [--create] [--all]
 
-    if args.all or args.test:
-        if not test_database_connection():
-            logger.error("Database connection test failed")
-            sys.exit(1)
+Database Initialization
 
-    if args.all or args.create:
-        if not create_database_tables():
-            logger.error("Database table creation failed")
-            sys.exit(1)
+options:
+  --info    Show database info
+  --test    Test database connections
+  --create  Create database tables
+  --all     Run all operations"""
 
-    if not any([args.test, args.create, args.info, args.all]):
+def main():
+    """Main function"""
+    flags = set(sys.argv[1:])
+
+    if flags & {"-h", "--help"}:
+        print(USAGE)
+        return
+
+    unknown = flags - ACTIONS.keys() - {"--all"}
+    if unknown:
+        print(USAGE, file=sys.stderr)
+        print(f"init_database.py: error: unrecognized arguments: {' '.join(sorted(unknown))}", file=sys.stderr)
+        sys.exit(2)
+
+    if not flags:
         # Default: show info and test connection
         show_database_info()
         test_database_connection()
+        return
+
+    if "--all" in flags:
+        flags = ACTIONS.keys()
+
+    for flag, action in ACTIONS.items():
+        if flag in flags:
+            action()
 
 if __name__ == "__main__":
     main()
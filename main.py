@@ -9,20 +9,34 @@ Author: AI Assistant
 Version: 1.0.0
 """
 
-import asyncio
-import sys
-from pathlib import Path
+from __future__ import annotations
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
+import sys
+import time
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping
 
-from src.core.user_interface import UserInterface
-from src.core.models import UserInput, ValidationResult
-from src.orchestrator.main_orchestrator import MainOrchestrator
+from src.utils import event_loop
 from src.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from src.core.models import UserInput, ValidationResult
+
 logger = get_logger("MainApplication")
 
+# Status statis untuk get_system_status(), dibangun sekali saat import
+_SYSTEM_STATUS: Mapping[str, Any] = MappingProxyType({
+    "status": "ready",
+    "version": "1.0.0",
+    "components": MappingProxyType({
+        "user_interface": "initialized",
+        "main_orchestrator": "ready",
+        "cp_atp_orchestrator": "ready",
+        "rag_strategies": ("simple", "advanced", "graph")
+    }),
+    "current_stage": "final_input_display"
+})
+
 class RAGMultiStrategyApp:
     """
     Main application class untuk RAG Multi-Strategy System
@@ -38,6 +52,10 @@ class RAGMultiStrategyApp:
     """
 
     def __init__(self):
+        # Import orchestrator dan UI saat aplikasi benar-benar dibuat
+        from src.core.user_interface import UserInterface
+        from src.orchestrator.main_orchestrator import MainOrchestrator
+
         self.ui = UserInterface()
         self.main_orchestrator = MainOrchestrator()
         logger.info("RAG Multi-Strategy System initialized")
@@ -47,34 +65,36 @@ class RAGMultiStrategyApp:
         Main entry point untuk menjalankan aplikasi
         Mengikuti alur flowchart yang telah didefinisikan
         """
-        try:
-            # Display welcome banner
-            self.ui.welcome_banner()
-            logger.step("Application Start", "Memulai sistem RAG Multi-Strategy")
-
-            # Step 1: Collect User Input
-            user_input = await self._collect_user_input()
+        while True:
+            try:
+                # Display welcome banner
+                self.ui.welcome_banner()
+                logger.step("Application Start", "Memulai sistem RAG Multi-Strategy")
 
-            # Step 2: Process through Main Orchestrator
-            final_input = await self._process_with_orchestrator(user_input)
+                # Step 1: Collect User Input
+                user_input = await self._collect_user_input()
 
-            # Step 3: Display Final Input (End point untuk fase ini)
-            await self._display_final_result(final_input)
+                # Step 2: Process through Main Orchestrator
+                final_input = await self._process_with_orchestrator(user_input)
 
-            logger.success("Sistem berhasil menyelesaikan proses hingga Final Input")
+                # Step 3: Display Final Input (End point untuk fase ini)
+                await self._display_final_result(final_input)
 
-        except KeyboardInterrupt:
-            logger.warning("Aplikasi dihentikan oleh user")
-            if self.ui.confirm_exit():
-                logger.info("Aplikasi ditutup")
+                logger.success("Sistem berhasil menyelesaikan proses hingga Final Input")
                 return
-            else:
-                await self.run()  # Restart application
 
-        except Exception as e:
-            logger.error(f"Error dalam aplikasi: {str(e)}")
-            self.ui.show_error(f"Terjadi kesalahan: {str(e)}")
-            raise
+            except KeyboardInterrupt:
+                logger.warning("Aplikasi dihentikan oleh user")
+                if self.ui.confirm_exit():
+                    logger.info("Aplikasi ditutup")
+                    return
+                # Restart application
+                continue
+
+            except Exception as e:
+                logger.error(f"Error dalam aplikasi: {str(e)}")
+                self.ui.show_error(f"Terjadi kesalahan: {str(e)}")
+                raise
 
     async def _collect_user_input(self) -> UserInput:
         """
@@ -138,11 +158,10 @@ class RAGMultiStrategyApp:
         logger.step("CP/ATP Generation Flow", "Memulai alur generation dan validasi CP/ATP")
 
         max_iterations = 3
-        current_iteration = 0
+        validation_history = []
 
-        while current_iteration < max_iterations:
-            current_iteration += 1
-            logger.orchestrator_log(f"CP/ATP Generation Iteration {current_iteration}", "Main")
+        for iteration in range(1, max_iterations + 1):
+            logger.orchestrator_log(f"CP/ATP Generation Iteration {iteration}", "Main")
 
             # Step 4: Generate CP/ATP
             cp_atp_result = await self._generate_cp_atp(user_input)
@@ -155,31 +174,29 @@ class RAGMultiStrategyApp:
 
             # Step 5: User Validation CP/ATP
             validation_result = await self._get_user_validation()
+            validation_history.append(validation_result)
 
             if validation_result.is_approved:
                 logger.success("CP/ATP disetujui oleh user")
-                # Create final input dengan approved CP/ATP
-                return await self._create_final_input_with_cp_atp(
-                    user_input, cp_atp_result, [validation_result]
-                )
+                break
+
+            if iteration == max_iterations:
+                # Gunakan hasil terakhir
+                logger.warning("Maximum iterations reached untuk CP/ATP generation")
+                break
 
             # Step 6: Retrieve RAG Refinement Strategy
-            if current_iteration < max_iterations:
-                logger.orchestrator_log("CP/ATP tidak disetujui, melakukan refinement", "Main")
-                await self._show_refinement_process()
+            logger.orchestrator_log("CP/ATP tidak disetujui, melakukan refinement", "Main")
+            await self._show_refinement_process()
 
-                # Refine strategy based on feedback
-                # (Integration dengan CP/ATP Orchestrator untuk refinement)
-                user_input = await self._refine_based_on_feedback(user_input, validation_result)
-            else:
-                logger.warning("Maximum iterations reached untuk CP/ATP generation")
-                # Gunakan hasil terakhir
-                return await self._create_final_input_with_cp_atp(
-                    user_input, cp_atp_result, [validation_result]
-                )
+            # Refine strategy based on feedback
+            # (Integration dengan CP/ATP Orchestrator untuk refinement)
+            user_input = await self._refine_based_on_feedback(user_input, validation_result)
 
-        # Fallback - shouldn't reach here
-        raise Exception("Failed to generate acceptable CP/ATP after maximum iterations")
+        # Create final input dengan CP/ATP terakhir
+        return await self._create_final_input_with_cp_atp(
+            user_input, cp_atp_result, validation_history
+        )
 
     async def _generate_cp_atp(self, user_input: UserInput):
         """Generate CP/ATP menggunakan orchestrator"""
@@ -246,7 +263,7 @@ class RAGMultiStrategyApp:
             "confidence_score": cp_atp_result.confidence_score,
             "sources_used": cp_atp_result.sources_used,
             "validation_iterations": len(validation_history),
-            "timestamp": "2024-08-20 12:00:00"  # Would be actual timestamp
+            "timestamp_ns": time.time_ns()  # Di-render ke ISO saat display
         }
 
         final_input = FinalInput(
@@ -288,12 +305,12 @@ class RAGMultiStrategyApp:
         (Tahap modul ajar generation yang akan dikembangkan kemudian)
         """
         try:
-            # Convert to dict for saving
-            final_input_dict = final_input.to_dict()
-
             # Log untuk development tracking
             logger.info("Final input ready untuk tahap modul ajar generation")
-            logger.debug(f"Final input contains: CP ({len(final_input.cp_content)} chars), ATP ({len(final_input.atp_content)} chars)")
+            logger.debug(
+                "Final input contains: CP (%d chars), ATP (%d chars)",
+                len(final_input.cp_content), len(final_input.atp_content)
+            )
 
             # Dalam implementasi nyata, ini bisa save ke database atau file
             # untuk digunakan di tahap selanjutnya
@@ -302,19 +319,9 @@ class RAGMultiStrategyApp:
             logger.warning(f"Failed to save final input for next stage: {str(e)}")
             # Non-critical error, tidak perlu stop aplikasi
 
-    def get_system_status(self) -> dict:
-        """Get current system status untuk monitoring"""
-        return {
-            "status": "ready",
-            "version": "1.0.0",
-            "components": {
-                "user_interface": "initialized",
-                "main_orchestrator": "ready",
-                "cp_atp_orchestrator": "ready",
-                "rag_strategies": ["simple", "advanced", "graph"]
-            },
-            "current_stage": "final_input_display"
-        }
+    def get_system_status(self) -> Mapping[str, Any]:
+        """Get current system status untuk monitoring (read-only)"""
+        return _SYSTEM_STATUS
 
 
 async def main():
@@ -334,12 +341,13 @@ async def main():
         sys.exit(1)
 
 
-if __name__ == "__main__":
+def entry():
     """
     Entry point untuk aplikasi
 
     Usage:
         python main.py
+        rag-orchestra
     """
 
     # Setup logging
@@ -347,7 +355,7 @@ if __name__ == "__main__":
 
     try:
         # Run the async application
-        asyncio.run(main())
+        event_loop.run(main())
     except KeyboardInterrupt:
         logger.info("Application terminated by user")
         print("\n👋 Terima kasih telah menggunakan RAG Multi-Strategy System!")
@@ -355,3 +363,7 @@ if __name__ == "__main__":
         logger.critical(f"Failed to start application: {str(e)}")
         print(f"\n💥 Failed to start: {str(e)}")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    entry()
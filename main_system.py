@@ -13,21 +13,15 @@ Updated: Sesuai dengan instruksi Orchestrated RAG terbaru
 import asyncio
 import sys
 import os
-from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-# Add src to path
-sys.path.append(str(Path(__file__).parent / "src"))
+import orjson
 
 try:
     from src.core.models import UserInput, LLMModel
-    from src.orchestrator.enhanced_main_orchestrator import get_enhanced_main_orchestrator
-    from src.services.llm_service import get_llm_service
-    from src.services.vector_db_service import get_vector_db_service
-    from src.services.online_search_service import get_online_search_service
+    from src.utils import event_loop
     from src.utils.logger import get_logger
-    from src.core.prompt_builder_agent import PromptBuilderAgent
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Please ensure all dependencies are installed.")
@@ -35,6 +29,77 @@ except ImportError as e:
 
 logger = get_logger("SystemInitializer")
 
+# Field UserInput yang ditanyakan di interactive mode: (field, prompt)
+_INPUT_FIELDS = (
+    ("nama_guru", "Nama Guru: "),
+    ("nama_sekolah", "Nama Sekolah: "),
+    ("mata_pelajaran", "Mata Pelajaran: "),
+    ("kelas", "Kelas: "),
+    ("fase", "Fase (A/B/C): "),
+    ("topik", "Topik: "),
+    ("sub_topik", "Sub Topik: "),
+    ("alokasi_waktu", "Alokasi Waktu: "),
+)
+
+# Pilihan LLM model untuk interactive mode: (model, label menu)
+_LLM_CHOICES = (
+    (LLMModel.GEMINI_1_5_FLASH, "Gemini 1.5 Flash"),
+    (LLMModel.GEMINI_1_5_PRO, "Gemini 1.5 Pro"),
+    (LLMModel.GPT_4, "GPT-4"),
+    (LLMModel.GPT_3_5_TURBO, "GPT-3.5 Turbo"),
+)
+_LLM_BY_CHOICE = {str(i): model for i, (model, _) in enumerate(_LLM_CHOICES, start=1)}
+
+# Batas waktu per health check agar satu backend lambat tidak menahan startup
+HEALTH_CHECK_TIMEOUT = 5
+
+_BAR60 = "=" * 60
+_BAR80 = "=" * 80
+
+def _banner(title: str, bar: str = _BAR60):
+    """Print judul section diapit separator"""
+    print(f"\n{bar}\n{title}\n{bar}")
+
+def _dump_json(data: Dict[str, Any]) -> bytes:
+    """Serialize ke JSON (indent 2, UTF-8)"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+def _write_json(payload: bytes):
+    """Tulis JSON bytes langsung ke stdout"""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+async def _ainput(prompt: str = "") -> str:
+    """input() tanpa memblokir event loop.
+
+    Untuk terminal, stdin ditunggu lewat loop.add_reader sehingga tidak ada
+    thread yang menahan shutdown saat Ctrl+C; pipe/file dan loop tanpa
+    add_reader (Windows proactor) memakai thread seperti biasa.
+    """
+    loop = asyncio.get_running_loop()
+    if not sys.stdin.isatty():
+        return await asyncio.to_thread(input, prompt)
+
+    ready = loop.create_future()
+    fd = sys.stdin.fileno()
+    try:
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+    except NotImplementedError:
+        return await asyncio.to_thread(input, prompt)
+
+    print(prompt, end="", flush=True)
+    try:
+        await ready
+    finally:
+        loop.remove_reader(fd)
+
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
 class RAGOrchestraSystem:
     """
     Main system class untuk RAG Orchestra
@@ -46,35 +111,73 @@ class RAGOrchestraSystem:
         self.vector_db_service = None
         self.online_search_service = None
         self.prompt_builder = None
+        self.health_status: Dict[str, Any] = {}
 
         self.initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
 
     async def initialize(self):
-        """Initialize semua komponen sistem"""
+        """Initialize semua komponen sistem (idempotent, single-flight)"""
+        if self.initialized:
+            return
+
+        # Lock dibuat lazily agar tidak butuh running loop saat __init__
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+
+        async with self._init_lock:
+            if not self.initialized:
+                await self._do_initialize()
+
+    async def _do_initialize(self):
+        """Bangun semua komponen sistem"""
+        # Import orchestrator dan services (LLM SDKs, chromadb) hanya saat
+        # sistem benar-benar di-initialize
+        try:
+            from src.orchestrator.enhanced_main_orchestrator import get_enhanced_main_orchestrator
+            from src.services.llm_service import get_llm_service
+            from src.services.vector_db_service import get_vector_db_service
+            from src.services.online_search_service import get_online_search_service
+        except ImportError as e:
+            logger.error(f"Error importing modules: {e}")
+            print("Please ensure all dependencies are installed.")
+            raise
+
         try:
             logger.info("Initializing RAG Orchestra System...")
 
-            # Initialize services
-            logger.info("Initializing LLM Service...")
-            self.llm_service = get_llm_service()
+            # Initialize services (factory sinkron dijalankan di thread,
+            # komponen yang independen dibangun paralel)
+            logger.info("Initializing LLM Service and Online Search Service...")
+            self.llm_service, self.online_search_service = await asyncio.gather(
+                asyncio.to_thread(get_llm_service),
+                asyncio.to_thread(get_online_search_service)
+            )
 
             logger.info("Initializing Vector DB Service...")
-            self.vector_db_service = get_vector_db_service(self.llm_service)
+            self.vector_db_service = await asyncio.to_thread(
+                get_vector_db_service, self.llm_service
+            )
 
-            logger.info("Initializing Online Search Service...")
-            self.online_search_service = get_online_search_service()
+            # Health check hanya membaca services di atas, sehingga bisa
+            # berjalan bersamaan dengan pembangunan orchestrator
+            health_task = asyncio.create_task(self._health_check())
 
-            logger.info("Initializing Enhanced Main Orchestrator...")
-            self.orchestrator = get_enhanced_main_orchestrator()
+            try:
+                # Orchestrator memakai singleton services di atas, sehingga
+                # dibangun setelahnya
+                logger.info("Initializing Enhanced Main Orchestrator...")
+                self.orchestrator = await asyncio.to_thread(get_enhanced_main_orchestrator)
+            except BaseException:
+                health_task.cancel()
+                raise
 
-            logger.info("Initializing Prompt Builder Agent...")
-            self.prompt_builder = PromptBuilderAgent(
-                self.llm_service,
-                self.vector_db_service
-            )
+            # Pakai Prompt Builder Agent milik orchestrator singleton
+            # daripada membangun instance kedua
+            self.prompt_builder = self.orchestrator.prompt_builder
 
-            # Check system health
-            await self._health_check()
+            # Tunggu hasil health check sebelum sistem dianggap siap
+            self.health_status = await health_task
 
             self.initialized = True
             logger.success("RAG Orchestra System initialized successfully!")
@@ -83,45 +186,38 @@ class RAGOrchestraSystem:
             logger.error(f"Failed to initialize system: {str(e)}")
             raise
 
+    async def shutdown(self):
+        """Release pooled clients milik services"""
+        services = (self.llm_service, self.vector_db_service, self.online_search_service, self.prompt_builder)
+        await asyncio.gather(
+            *(service.aclose() for service in services if service and hasattr(service, "aclose")),
+            return_exceptions=True
+        )
+
     async def _health_check(self):
-        """Perform health check untuk semua services"""
+        """Perform health check untuk semua services (paralel)"""
         logger.info("Performing system health check...")
 
-        health_results = {}
-
-        # Check LLM Service
-        try:
-            llm_health = await self.llm_service.health_check()
-            health_results["llm_service"] = llm_health
-            logger.info(f"LLM Service health: {llm_health}")
-        except Exception as e:
-            health_results["llm_service"] = {"error": str(e)}
-            logger.warning(f"LLM Service health check failed: {str(e)}")
-
-        # Check Vector DB Service
-        try:
-            vector_stats = await self.vector_db_service.get_collection_stats()
-            health_results["vector_db_service"] = vector_stats
-            logger.info(f"Vector DB stats: {vector_stats}")
-        except Exception as e:
-            health_results["vector_db_service"] = {"error": str(e)}
-            logger.warning(f"Vector DB health check failed: {str(e)}")
-
-        # Check Online Search Service
-        try:
-            search_health = await self.online_search_service.health_check()
-            health_results["online_search_service"] = search_health
-            logger.info(f"Online Search health: {search_health}")
-        except Exception as e:
-            health_results["online_search_service"] = {"error": str(e)}
-            logger.warning(f"Online Search health check failed: {str(e)}")
+        async def check(key: str, label: str, probe):
+            try:
+                result = await asyncio.wait_for(probe(), timeout=HEALTH_CHECK_TIMEOUT)
+                logger.info(f"{label}: {result}")
+            except Exception as e:
+                result = {"error": str(e) or type(e).__name__}
+                logger.warning(f"{label} check failed: {result['error']}")
+            return key, result
+
+        results = await asyncio.gather(
+            check("llm_service", "LLM Service health", self.llm_service.health_check),
+            check("vector_db_service", "Vector DB stats", self.vector_db_service.get_collection_stats),
+            check("online_search_service", "Online Search health", self.online_search_service.health_check)
+        )
 
-        return health_results
+        return dict(results)
 
     async def run_demo(self):
         """Run demo dari sistem untuk testing"""
-        if not self.initialized:
-            await self.initialize()
+        await self.initialize()
 
         logger.info("Running RAG Orchestra Demo...")
 
@@ -164,12 +260,9 @@ class RAGOrchestraSystem:
             result_json = complete_input.to_json_standard()
 
             # Pretty print hasil
-            import json
-            print("\n" + "="*80)
-            print("COMPLETE INPUT JSON STANDARD FORMAT")
-            print("="*80)
-            print(json.dumps(result_json, indent=2, ensure_ascii=False))
-            print("="*80)
+            _banner("COMPLETE INPUT JSON STANDARD FORMAT", _BAR80)
+            _write_json(_dump_json(result_json))
+            print(_BAR80)
 
             return complete_input
 
@@ -179,72 +272,40 @@ class RAGOrchestraSystem:
 
     async def run_interactive_mode(self):
         """Run interactive mode untuk user input"""
-        if not self.initialized:
-            await self.initialize()
+        await self.initialize()
 
         logger.info("Starting Interactive Mode...")
-        print("\n" + "="*60)
-        print("RAG ORCHESTRA - INTERACTIVE MODE")
-        print("="*60)
+        _banner("RAG ORCHESTRA - INTERACTIVE MODE")
         print("Masukkan data untuk generate Complete Input:")
         print()
 
         try:
             # Collect user input
-            nama_guru = input("Nama Guru: ")
-            nama_sekolah = input("Nama Sekolah: ")
-            mata_pelajaran = input("Mata Pelajaran: ")
-            kelas = input("Kelas: ")
-            fase = input("Fase (A/B/C): ")
-            topik = input("Topik: ")
-            sub_topik = input("Sub Topik: ")
-            alokasi_waktu = input("Alokasi Waktu: ")
+            data = {field: await _ainput(prompt) for field, prompt in _INPUT_FIELDS}
 
             print("\nPilih LLM Model:")
-            print("1. Gemini 1.5 Flash")
-            print("2. Gemini 1.5 Pro")
-            print("3. GPT-4")
-            print("4. GPT-3.5 Turbo")
-
-            llm_choice = input("Pilihan (1-4): ")
-            llm_mapping = {
-                "1": LLMModel.GEMINI_1_5_FLASH,
-                "2": LLMModel.GEMINI_1_5_PRO,
-                "3": LLMModel.GPT_4,
-                "4": LLMModel.GPT_3_5_TURBO
-            }
-            model_llm = llm_mapping.get(llm_choice, LLMModel.GEMINI_1_5_FLASH)
+            for choice, (_, label) in enumerate(_LLM_CHOICES, start=1):
+                print(f"{choice}. {label}")
+
+            llm_choice = await _ainput(f"Pilihan (1-{len(_LLM_CHOICES)}): ")
+            data["model_llm"] = _LLM_BY_CHOICE.get(llm_choice, LLMModel.GEMINI_1_5_FLASH)
 
             # Optional CP/ATP input
             print("\nApakah Anda sudah memiliki CP dan ATP? (y/n)")
-            has_cp_atp = input().lower() == 'y'
+            has_cp_atp = (await _ainput()).lower() == 'y'
 
-            cp = None
-            atp = None
+            data["cp"] = None
+            data["atp"] = None
             if has_cp_atp:
                 print("\nMasukkan CP (Capaian Pembelajaran):")
-                cp = input()
+                data["cp"] = await _ainput()
                 print("\nMasukkan ATP (Alur Tujuan Pembelajaran):")
-                atp = input()
+                data["atp"] = await _ainput()
 
             # Create UserInput
-            user_input = UserInput(
-                nama_guru=nama_guru,
-                nama_sekolah=nama_sekolah,
-                mata_pelajaran=mata_pelajaran,
-                kelas=kelas,
-                fase=fase,
-                topik=topik,
-                sub_topik=sub_topik,
-                alokasi_waktu=alokasi_waktu,
-                model_llm=model_llm,
-                cp=cp,
-                atp=atp
-            )
+            user_input = UserInput(**data)
 
-            print("\n" + "="*60)
-            print("MEMPROSES...")
-            print("="*60)
+            _banner("MEMPROSES...")
 
             # Progress callback
             async def interactive_callback(event_type: str, data: Dict[str, Any]):
@@ -259,22 +320,19 @@ class RAGOrchestraSystem:
             )
 
             # Display results
-            print("\n" + "="*60)
-            print("HASIL COMPLETE INPUT")
-            print("="*60)
-
-            result_json = complete_input.to_json_standard()
+            _banner("HASIL COMPLETE INPUT")
 
-            import json
-            print(json.dumps(result_json, indent=2, ensure_ascii=False))
+            # Serialize sekali, dipakai untuk display dan simpan file
+            result_bytes = _dump_json(complete_input.to_json_standard())
+            _write_json(result_bytes)
 
             # Ask to save results
-            print("\n" + "="*60)
-            save_choice = input("Simpan hasil ke file? (y/n): ")
+            print("\n" + _BAR60)
+            save_choice = await _ainput("Simpan hasil ke file? (y/n): ")
             if save_choice.lower() == 'y':
                 filename = f"complete_input_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(result_json, f, indent=2, ensure_ascii=False)
+                with open(filename, 'wb') as f:
+                    f.write(result_bytes)
                 print(f"Hasil disimpan ke: {filename}")
 
             return complete_input
@@ -282,6 +340,10 @@ class RAGOrchestraSystem:
         except KeyboardInterrupt:
             print("\n\nInteractive mode dibatalkan.")
             return None
+        except asyncio.CancelledError:
+            # Ctrl+C di bawah asyncio.run meng-cancel main task, bukan raise KeyboardInterrupt
+            print("\n\nInteractive mode dibatalkan.")
+            raise
         except Exception as e:
             logger.error(f"Error in interactive mode: {str(e)}")
             print(f"\nError: {str(e)}")
@@ -289,40 +351,50 @@ class RAGOrchestraSystem:
 
 async def main():
     """Main function"""
+    # Satu instance dipakai ulang antar menu sehingga services dan
+    # koneksi yang sudah dibangun tetap hidup
     system = RAGOrchestraSystem()
 
-    print("RAG Orchestra System")
-    print("===================")
-    print("1. Run Demo")
-    print("2. Run Interactive Mode")
-    print("3. Initialize Only")
-    print("4. Exit")
-
     try:
-        choice = input("\nPilih mode (1-4): ")
-
-        if choice == "1":
-            await system.run_demo()
-        elif choice == "2":
-            await system.run_interactive_mode()
-        elif choice == "3":
-            await system.initialize()
-            print("System initialized successfully!")
-        elif choice == "4":
-            print("Goodbye!")
-            return
-        else:
-            print("Invalid choice.")
+        await _run_menu(system)
+    finally:
+        await system.shutdown()
+
+async def _run_menu(system: RAGOrchestraSystem):
+    """Menu loop untuk main()"""
+    while True:
+        print("RAG Orchestra System")
+        print("===================")
+        print("1. Run Demo")
+        print("2. Run Interactive Mode")
+        print("3. Initialize Only")
+        print("4. Exit")
 
-    except Exception as e:
-        logger.error(f"Error in main: {str(e)}")
-        print(f"Error: {str(e)}")
+        try:
+            choice = await _ainput("\nPilih mode (1-4): ")
+
+            if choice == "1":
+                await system.run_demo()
+            elif choice == "2":
+                await system.run_interactive_mode()
+            elif choice == "3":
+                await system.initialize()
+                print("System initialized successfully!")
+            elif choice == "4":
+                print("Goodbye!")
+                return
+            else:
+                print("Invalid choice.")
 
-if __name__ == "__main__":
-    import datetime
+        except Exception as e:
+            logger.error(f"Error in main: {str(e)}")
+            print(f"Error: {str(e)}")
 
+        print()
+
+if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        event_loop.run(main())
     except KeyboardInterrupt:
         print("\n\nProgram dihentikan.")
     except Exception as e:
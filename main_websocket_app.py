@@ -11,27 +11,124 @@ Updated: Sesuai dengan instruksi Orchestrated RAG terbaru
 """
 
 import asyncio
-import json
-from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Union
 from datetime import datetime
 import uuid
+from pathlib import Path
 
+import msgspec
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from src.core.models import UserInput, CompleteInput, LLMModel
 from src.orchestrator.enhanced_main_orchestrator import get_enhanced_main_orchestrator
+from src.utils import event_loop
 from src.utils.logger import get_logger
 
 logger = get_logger("WebSocketApp")
 
+# Map string llm_model_choice ke LLMModel enum
+_LLM_MODEL_MAP = {
+    "gemini-1.5-flash": LLMModel.GEMINI_1_5_FLASH,
+    "gemini-1.5-pro": LLMModel.GEMINI_1_5_PRO,
+    "gpt-4": LLMModel.GPT_4,
+    "gpt-3.5-turbo": LLMModel.GPT_3_5_TURBO,
+    # Legacy support
+    "gemini": LLMModel.GEMINI_1_5_FLASH,
+    "openai": LLMModel.GPT_3_5_TURBO
+}
+
+# Non-str keys (mis. int) tetap di-serialize seperti json.dumps sebelumnya.
+# Timestamp dikirim sebagai datetime dan diformat ISO 8601 oleh orjson/msgspec di C,
+# tanpa memanggil isoformat() per frame.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+_MISSING = object()
+
+
+def _json_default(obj):
+    """Fallback serializer orjson/msgspec untuk enum dan object kompleks.
+
+    Hanya dipanggil untuk tipe yang tidak dikenali encoder, sehingga
+    dict/list/str biasa tidak melewati fungsi ini.
+    """
+    if isinstance(obj, msgspec.Struct):
+        return msgspec.to_builtins(obj)
+    value = getattr(obj, 'value', _MISSING)  # Enum objects
+    if value is not _MISSING:
+        return value
+    attrs = getattr(obj, '__dict__', None)  # Complex objects
+    if attrs is not None:
+        return attrs
+    return str(obj)
+
+
+def _dump_json(response: Dict[str, Any]) -> bytes:
+    """Encode frame dict ke JSON (UTF-8 bytes, dikirim sebagai binary frame)"""
+    return orjson.dumps(response, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+# Binary protocol (MessagePack) untuk internal clients yang meminta subprotocol "msgpack"
+MSGPACK_SUBPROTOCOL = "msgpack"
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder(enc_hook=_json_default)
+
+
+class WSResponse(msgspec.Struct):
+    """Frame response umum (binary protocol)"""
+    type: str
+    data: Dict[str, Any]
+    timestamp: datetime
+
+
+class SystemLog(msgspec.Struct):
+    """Frame system log (binary protocol)"""
+    type: str
+    message: str
+    metadata: Dict[str, Any]
+    timestamp: datetime
+    category: str = "system_log"
+
+
+class ContentResult(msgspec.Struct):
+    """Frame content result (binary protocol)"""
+    type: str
+    stage: Optional[str]
+    content: Dict[str, Any]
+    timestamp: datetime
+    category: str = "content_result"
+
+
+class ContentStream(msgspec.Struct):
+    """Frame potongan text CP/ATP selama streaming (binary protocol)"""
+    type: str
+    delta: str
+    timestamp: datetime
+    category: str = "content_stream"
+
+
+def _is_msgpack(websocket: WebSocket) -> bool:
+    """Cek apakah connection memakai binary protocol"""
+    return getattr(websocket.state, "msgpack", False)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release clients milik orchestrator (LLM, Redis response cache) saat shutdown"""
+    yield
+    await orchestrator.aclose()
+
 # FastAPI app
 app = FastAPI(
     title="RAG Orchestra Real-time API",
     description="Real-time Orchestrated RAG dengan WebSocket",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -43,46 +140,170 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress response HTTP (client HTML/JS, REST JSON) di atas 1 KB
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+CLIENT_DIR = Path(__file__).resolve().parent / "static" / "client"
+# HTML client dibaca sekali saat import, dikirim apa adanya tiap request
+CLIENT_HTML_BYTES: bytes = (CLIENT_DIR / "index.html").read_bytes()
+# Codec MessagePack untuk client, disajikan sendiri (tanpa CDN)
+CLIENT_MSGPACK_JS_BYTES: bytes = (CLIENT_DIR / "msgpack.js").read_bytes()
+
+# Timeout per frame saat relay ke socket
+SEND_TIMEOUT = 5.0
+# Maksimum item (frame/system_log) yang menunggu per client; saat penuh
+# system_log baru dibuang, frame lain membuat client dianggap stalled
+SEND_QUEUE_MAXSIZE = 256
+# Maksimum system_log berurutan yang digabung dalam satu frame
+LOG_BATCH_SIZE = 32
+
 # WebSocket connection manager
 class ConnectionManager:
     """Manager untuk WebSocket connections"""
 
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-        self.user_sessions: Dict[str, Dict[str, Any]] = {}
+        self.user_sessions: Dict[str, "SessionState"] = {}
+        # Send queue + relay task per client, terpisah dari user_sessions
+        # karena user_sessions di-serialize ke client dan REST API.
+        # Item queue: frame ter-encode (bytes) atau system_log entry
+        self.send_queues: Dict[str, asyncio.Queue] = {}
+        self.relay_tasks: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, session_id: str):
         """Connect WebSocket untuk session"""
-        await websocket.accept()
+        binary = MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", ())
+        if binary:
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await websocket.accept()
+        websocket.state.msgpack = binary
+        websocket.state.session_id = session_id
+        # Reconnect dengan session_id yang sama: hentikan relay milik socket lama
+        self._cancel_tasks(session_id)
         self.active_connections[session_id] = websocket
-        self.user_sessions[session_id] = {
-            "connected_at": datetime.now().isoformat(),
-            "status": "connected",
-            "current_process": None
-        }
+        self.user_sessions[session_id] = SessionState(connected_at=datetime.now(), binary=binary)
+        queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+        self.send_queues[session_id] = queue
+        websocket.state.dropped_logs = 0
+        self.relay_tasks[session_id] = asyncio.create_task(self._relay(session_id, websocket, queue))
         logger.info(f"WebSocket connected: {session_id}")
 
-    def disconnect(self, session_id: str):
-        """Disconnect WebSocket"""
+    def disconnect(self, session_id: str, websocket: Optional[WebSocket] = None):
+        """Disconnect WebSocket; jika websocket diberikan, hanya jika masih connection aktif session"""
+        if websocket is not None and self.active_connections.get(session_id) is not websocket:
+            return
         if session_id in self.active_connections:
             del self.active_connections[session_id]
         if session_id in self.user_sessions:
             del self.user_sessions[session_id]
+        self._cancel_tasks(session_id)
         logger.info(f"WebSocket disconnected: {session_id}")
 
+    def _cancel_tasks(self, session_id: str):
+        """Hentikan relay task dan buang send queue milik session"""
+        self.send_queues.pop(session_id, None)
+        task = self.relay_tasks.pop(session_id, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _relay(self, session_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Satu-satunya writer socket: kirim item dari queue sesuai urutan masuk.
+
+        System log yang berurutan di queue digabung menjadi satu frame (array),
+        tanpa melompati frame lain sehingga urutan log vs content result tetap.
+        """
+        binary = _is_msgpack(websocket)
+        pending = None
+        try:
+            while True:
+                item = pending if pending is not None else await queue.get()
+                pending = None
+                if not isinstance(item, bytes):
+                    batch = [item]
+                    while len(batch) < LOG_BATCH_SIZE and not queue.empty():
+                        next_item = queue.get_nowait()
+                        if isinstance(next_item, bytes):
+                            pending = next_item
+                            break
+                        batch.append(next_item)
+                    payload = batch[0] if len(batch) == 1 else batch
+                    item = _MSGPACK_ENCODER.encode(payload) if binary else _dump_json(payload)
+                await asyncio.wait_for(websocket.send_bytes(item), timeout=SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to send message to {session_id}: {str(e)}")
+            self._drop(session_id, websocket)
+
+    def enqueue_log(self, websocket: WebSocket, entry: Union[SystemLog, Dict[str, Any]]):
+        """Masukkan system_log ke send queue client; dibuang (dan dihitung) jika queue penuh"""
+        session_id = getattr(websocket.state, "session_id", None)
+        if session_id is None or self.active_connections.get(session_id) is not websocket:
+            return
+        queue = self.send_queues.get(session_id)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            websocket.state.dropped_logs += 1
+
+    def _enqueue(self, session_id: str, frame: bytes):
+        """Masukkan frame ke send queue client, drop client yang stalled"""
+        queue = self.send_queues.get(session_id)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            logger.warning(f"Send queue full, dropping stalled client: {session_id}")
+            self._drop(session_id, self.active_connections.get(session_id))
+
+    def enqueue_frame(self, websocket: WebSocket, frame: bytes):
+        """Kirim frame lewat send queue + relay milik connection (satu-satunya writer socket)"""
+        session_id = getattr(websocket.state, "session_id", None)
+        if session_id is not None and self.active_connections.get(session_id) is websocket:
+            self._enqueue(session_id, frame)
+
+    def _drop(self, session_id: str, websocket: Optional[WebSocket]):
+        """Disconnect client yang gagal/stalled dan tutup socket-nya agar receive loop berhenti"""
+        if websocket is None or self.active_connections.get(session_id) is not websocket:
+            return
+        self.disconnect(session_id, websocket)
+        asyncio.create_task(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+
     async def send_message(self, session_id: str, message: Dict[str, Any]):
         """Send message ke specific session"""
-        if session_id in self.active_connections:
-            try:
-                await self.active_connections[session_id].send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Failed to send message to {session_id}: {str(e)}")
-                self.disconnect(session_id)
+        websocket = self.active_connections.get(session_id)
+        if websocket is None:
+            return
+        if _is_msgpack(websocket):
+            self._enqueue(session_id, _MSGPACK_ENCODER.encode(message))
+        else:
+            self._enqueue(session_id, _dump_json(message))
 
     async def broadcast(self, message: Dict[str, Any]):
         """Broadcast message ke semua connections"""
-        for session_id in list(self.active_connections.keys()):
-            await self.send_message(session_id, message)
+        # Encode sekali per format, dipakai bersama oleh semua client
+        json_frame = None
+        binary_frame = None
+        for session_id, websocket in list(self.active_connections.items()):
+            if _is_msgpack(websocket):
+                if binary_frame is None:
+                    binary_frame = _MSGPACK_ENCODER.encode(message)
+                self._enqueue(session_id, binary_frame)
+            else:
+                if json_frame is None:
+                    json_frame = _dump_json(message)
+                self._enqueue(session_id, json_frame)
 
 # Global connection manager
 manager = ConnectionManager()
@@ -90,9 +311,27 @@ manager = ConnectionManager()
 # Global orchestrator
 orchestrator = get_enhanced_main_orchestrator()
 
+# Orchestrator event types yang dikirim sebagai system log / content result
+_SYSTEM_LOG_TYPES = frozenset({
+    "task_analysis_start", "task_analysis_complete",
+    "strategy_selection_start", "strategy_selection_complete",
+    "orchestration_decision", "input_analysis",
+    "searching_documents", "searching_online",
+    "generating_cp_atp", "generating_cp", "generating_atp",
+    "quality_monitoring", "re_routing", "adaptive_rag"
+})
+
+_CONTENT_RESULT_TYPES = frozenset({
+    "complete_input_ready", "cp_generated", "atp_generated",
+    "final_result"
+})
+
+# Potongan text CP/ATP yang di-stream saat generasi
+_CONTENT_STREAM_TYPES = frozenset({"cp_chunk", "atp_chunk"})
+
 # Request/Response models
-class ProcessingRequest(BaseModel):
-    """Request untuk memulai processing"""
+class ProcessingRequest(msgspec.Struct):
+    """Request untuk memulai processing (divalidasi msgspec, bukan Pydantic)"""
     nama_guru: str
     nama_sekolah: str
     mata_pelajaran: str
@@ -105,6 +344,60 @@ class ProcessingRequest(BaseModel):
     cp: Optional[str] = None
     atp: Optional[str] = None
 
+# Inbound message schema: tagged union berdasarkan field "type",
+# di-parse dan divalidasi langsung dari raw frame oleh msgspec
+class _InboundMessage(msgspec.Struct, tag_field="type"):
+    """Base inbound WebSocket message"""
+    data: Dict[str, Any] = {}
+
+class StartProcessingMessage(_InboundMessage, tag="start_processing"):
+    """Mulai orchestrated RAG processing"""
+
+class PingMessage(_InboundMessage, tag="ping"):
+    """Ping keep-alive"""
+
+class GetStatusMessage(_InboundMessage, tag="get_status"):
+    """Minta status session"""
+
+class CancelProcessingMessage(_InboundMessage, tag="cancel_processing"):
+    """Batalkan processing"""
+
+class ApproveValidationMessage(_InboundMessage, tag="approve_validation"):
+    """Setujui CP/ATP hasil validasi"""
+
+class RegenerateContentMessage(_InboundMessage, tag="regenerate_content"):
+    """Generate ulang CP/ATP"""
+
+class CancelValidationMessage(_InboundMessage, tag="cancel_validation"):
+    """Batalkan proses validasi"""
+
+MessageSchema = Union[
+    StartProcessingMessage,
+    PingMessage,
+    GetStatusMessage,
+    CancelProcessingMessage,
+    ApproveValidationMessage,
+    RegenerateContentMessage,
+    CancelValidationMessage,
+]
+
+_JSON_DECODER = msgspec.json.Decoder(MessageSchema)
+_MSGPACK_DECODER = msgspec.msgpack.Decoder(MessageSchema)
+
+@dataclass(slots=True)
+class SessionState:
+    """State per session; request disimpan sekali sebagai struct tervalidasi"""
+    connected_at: datetime
+    status: str = "connected"
+    current_process: Optional[str] = None
+    binary: bool = False
+    request: Optional[ProcessingRequest] = None
+    generated_cp: str = ""
+    generated_atp: str = ""
+    validated_cp: str = ""
+    validated_atp: str = ""
+    validation_status: Optional[str] = None
+
 class SessionStatus(BaseModel):
     """Status session"""
     session_id: str
@@ -113,28 +406,11 @@ class SessionStatus(BaseModel):
     progress: Optional[Dict[str, Any]] = None
 
 # WebSocket message handler
-async def handle_websocket_message(websocket: WebSocket, session_id: str, message: Dict[str, Any]):
+async def handle_websocket_message(websocket: WebSocket, session_id: str, message: _InboundMessage):
     """Handle incoming WebSocket messages"""
     try:
-        message_type = message.get("type", "")
-        data = message.get("data", {})
-
-        if message_type == "start_processing":
-            await start_processing(websocket, session_id, data)
-        elif message_type == "ping":
-            await send_websocket_response(websocket, "pong", {"timestamp": datetime.now().isoformat()})
-        elif message_type == "get_status":
-            await send_session_status(websocket, session_id)
-        elif message_type == "cancel_processing":
-            await cancel_processing(websocket, session_id)
-        elif message_type == "approve_validation":
-            await approve_validation(websocket, session_id, data)
-        elif message_type == "regenerate_content":
-            await regenerate_content(websocket, session_id, data)
-        elif message_type == "cancel_validation":
-            await cancel_validation(websocket, session_id)
-        else:
-            await send_websocket_response(websocket, "error", {"message": f"Unknown message type: {message_type}"})
+        handler = _HANDLERS[type(message)]
+        await handler(websocket, session_id, message.data)
 
     except Exception as e:
         logger.error(f"Error handling WebSocket message: {str(e)}")
@@ -144,30 +420,37 @@ async def start_processing(websocket: WebSocket, session_id: str, data: Dict[str
     """Start processing dengan real-time updates"""
     try:
         # Validate input data
-        processing_request = ProcessingRequest(**data)
+        processing_request = msgspec.convert(data, ProcessingRequest)
+    except msgspec.ValidationError as e:
+        logger.error(f"Error in processing: {str(e)}")
+        await send_system_log(websocket, "processing_error",
+                             f"Processing failed: {str(e)}",
+                             {"error_type": type(e).__name__, "session_id": session_id})
+        return
+
+    await _process_request(websocket, session_id, processing_request)
+
+async def _process_request(websocket: WebSocket, session_id: str, processing_request: ProcessingRequest,
+                           regenerate_only: bool = False):
+    """Jalankan orchestrator untuk request tervalidasi dan kirim hasilnya.
 
+    Dengan regenerate_only, hanya CP/ATP yang di-generate ulang tanpa
+    task analysis dan strategy selection.
+    """
+    try:
         # Update session status
-        manager.user_sessions[session_id]["current_process"] = "orchestrated_rag"
-        manager.user_sessions[session_id]["status"] = "processing"
+        session = manager.user_sessions[session_id]
+        session.current_process = "orchestrated_rag"
+        session.status = "processing"
 
-        # Send acknowledgment as system log
-        await send_system_log(websocket, "processing_started",
-                             "Orchestrated RAG processing started",
-                             {"session_id": session_id})
+        if not regenerate_only:
+            # Send acknowledgment as system log
+            await send_system_log(websocket, "processing_started",
+                                 "Orchestrated RAG processing started",
+                                 {"session_id": session_id})
 
         # Convert to UserInput
-        # Map string to LLMModel enum
-        llm_model_mapping = {
-            "gemini-1.5-flash": LLMModel.GEMINI_1_5_FLASH,
-            "gemini-1.5-pro": LLMModel.GEMINI_1_5_PRO,
-            "gpt-4": LLMModel.GPT_4,
-            "gpt-3.5-turbo": LLMModel.GPT_3_5_TURBO,
-            # Legacy support
-            "gemini": LLMModel.GEMINI_1_5_FLASH,
-            "openai": LLMModel.GPT_3_5_TURBO
-        }
-
-        model_llm = llm_model_mapping.get(
+        model_llm = _LLM_MODEL_MAP.get(
             processing_request.llm_model_choice,
             LLMModel.GEMINI_1_5_FLASH
         )
@@ -186,27 +469,14 @@ async def start_processing(websocket: WebSocket, session_id: str, data: Dict[str
             atp=processing_request.atp
         )
 
-        # Store original input for potential regeneration
-        manager.user_sessions[session_id]["original_input"] = data
+        # Store validated request for potential regeneration
+        session.request = processing_request
 
         # Create callback untuk real-time updates dengan separation
         async def websocket_callback(event_type: str, event_data: Dict[str, Any]):
-            # Determine if this is a system log or content result
-            system_log_types = [
-                "task_analysis_start", "task_analysis_complete",
-                "strategy_selection_start", "strategy_selection_complete",
-                "orchestration_decision", "input_analysis",
-                "searching_documents", "searching_online",
-                "generating_cp_atp", "generating_cp", "generating_atp",
-                "quality_monitoring", "re_routing", "adaptive_rag"
-            ]
-
-            content_result_types = [
-                "complete_input_ready", "cp_generated", "atp_generated",
-                "final_result"
-            ]
-
             # Special handling for CP/ATP generation completion
+            # complete_input dikirim sebagai CompleteInput dataclass; orjson/msgspec
+            # meng-encode dataclass dan Enum langsung saat frame dikirim
             if event_type == "complete_input_ready" and event_data.get("complete_input"):
                 complete_input = event_data["complete_input"]
 
@@ -219,39 +489,49 @@ async def start_processing(websocket: WebSocket, session_id: str, data: Dict[str
                     # Trigger validation modal
                     await send_content_result(websocket, "cp_atp_generated", {
                         "requires_validation": True,
-                        "generated_cp": complete_input.get("cp", ""),
-                        "generated_atp": complete_input.get("atp", ""),
+                        "generated_cp": complete_input.cp,
+                        "generated_atp": complete_input.atp,
                         "session_id": session_id,
                         "message": "CP/ATP generated, awaiting user validation"
                     }, stage="validation")
 
                     # Store generated content for validation
-                    manager.user_sessions[session_id]["generated_cp"] = complete_input.get("cp", "")
-                    manager.user_sessions[session_id]["generated_atp"] = complete_input.get("atp", "")
-                    manager.user_sessions[session_id]["status"] = "awaiting_validation"
+                    session.generated_cp = complete_input.cp
+                    session.generated_atp = complete_input.atp
+                    session.status = "awaiting_validation"
 
                     return  # Don't continue processing until validation
                 else:
                     # User provided CP/ATP, continue with final result
                     await send_content_result(websocket, event_type, event_data, stage="generation")
+                    return
 
-            if event_type in system_log_types:
+            # Determine if this is a system log or content result
+            if event_type in _SYSTEM_LOG_TYPES:
                 # Send as system log
-                message = event_data.get("message", f"{event_type} event")
-                metadata = {k: v for k, v in event_data.items() if k != "message"}
+                metadata = event_data.copy()
+                message = metadata.pop("message", f"{event_type} event")
                 await send_system_log(websocket, event_type, message, metadata)
-            elif event_type in content_result_types:
+            elif event_type in _CONTENT_RESULT_TYPES:
                 # Send as content result
                 await send_content_result(websocket, event_type, event_data, stage="generation")
+            elif event_type in _CONTENT_STREAM_TYPES:
+                await send_content_stream(websocket, event_type, event_data["delta"])
             else:
                 # Fallback to original method for unknown types
                 await send_websocket_response(websocket, event_type, event_data)
 
         # Process dengan orchestrator
-        complete_input = await orchestrator.orchestrate_complete_input(
-            user_input=user_input,
-            callback_func=websocket_callback
-        )
+        if regenerate_only:
+            complete_input = await orchestrator.regenerate_cp_atp(
+                user_input=user_input,
+                callback_func=websocket_callback
+            )
+        else:
+            complete_input = await orchestrator.orchestrate_complete_input(
+                user_input=user_input,
+                callback_func=websocket_callback
+            )
 
         # Send final result as content
         await send_content_result(websocket, "final_complete_input", {
@@ -264,8 +544,8 @@ async def start_processing(websocket: WebSocket, session_id: str, data: Dict[str
         }, stage="final")
 
         # Update session status
-        manager.user_sessions[session_id]["current_process"] = None
-        manager.user_sessions[session_id]["status"] = "completed"
+        session.current_process = None
+        session.status = "completed"
 
     except Exception as e:
         logger.error(f"Error in processing: {str(e)}")
@@ -274,14 +554,21 @@ async def start_processing(websocket: WebSocket, session_id: str, data: Dict[str
                              {"error_type": type(e).__name__, "session_id": session_id})
 
         # Update session status
-        manager.user_sessions[session_id]["current_process"] = None
-        manager.user_sessions[session_id]["status"] = "error"
+        session = manager.user_sessions.get(session_id)
+        if session is not None:
+            session.current_process = None
+            session.status = "error"
+
+async def _handle_ping(websocket: WebSocket, session_id: str, data: Dict[str, Any] = None):
+    """Balas ping dengan pong"""
+    await send_websocket_response(websocket, "pong", {"timestamp": datetime.now()})
 
-async def cancel_processing(websocket: WebSocket, session_id: str):
+async def cancel_processing(websocket: WebSocket, session_id: str, data: Dict[str, Any] = None):
     """Cancel ongoing processing"""
-    if session_id in manager.user_sessions:
-        manager.user_sessions[session_id]["current_process"] = None
-        manager.user_sessions[session_id]["status"] = "cancelled"
+    session = manager.user_sessions.get(session_id)
+    if session is not None:
+        session.current_process = None
+        session.status = "cancelled"
 
     await send_websocket_response(websocket, "processing_cancelled", {
         "message": "Processing cancelled by user"
@@ -294,10 +581,11 @@ async def approve_validation(websocket: WebSocket, session_id: str, data: Dict[s
         validated_atp = data.get("validated_atp", "")
 
         # Store validated content in session
-        if session_id in manager.user_sessions:
-            manager.user_sessions[session_id]["validated_cp"] = validated_cp
-            manager.user_sessions[session_id]["validated_atp"] = validated_atp
-            manager.user_sessions[session_id]["validation_status"] = "approved"
+        session = manager.user_sessions.get(session_id)
+        if session is not None:
+            session.validated_cp = validated_cp
+            session.validated_atp = validated_atp
+            session.validation_status = "approved"
 
         await send_system_log(websocket, "validation_approved",
                              "User approved CP/ATP content",
@@ -320,11 +608,11 @@ async def regenerate_content(websocket: WebSocket, session_id: str, data: Dict[s
                              {"session_id": session_id})
 
         # Get original input from session
-        if session_id in manager.user_sessions:
-            original_input = manager.user_sessions[session_id].get("original_input")
-            if original_input:
-                # Restart CP/ATP generation process
-                await start_processing(websocket, session_id, original_input)
+        session = manager.user_sessions.get(session_id)
+        if session is not None:
+            if session.request is not None:
+                # Generate ulang CP/ATP saja dari request yang tersimpan
+                await _process_request(websocket, session_id, session.request, regenerate_only=True)
             else:
                 await send_system_log(websocket, "regeneration_error",
                                      "Original input not found",
@@ -336,12 +624,13 @@ async def regenerate_content(websocket: WebSocket, session_id: str, data: Dict[s
                              f"Error regenerating content: {str(e)}",
                              {"session_id": session_id})
 
-async def cancel_validation(websocket: WebSocket, session_id: str):
+async def cancel_validation(websocket: WebSocket, session_id: str, data: Dict[str, Any] = None):
     """Cancel validation process"""
     try:
-        if session_id in manager.user_sessions:
-            manager.user_sessions[session_id]["validation_status"] = "cancelled"
-            manager.user_sessions[session_id]["status"] = "cancelled"
+        session = manager.user_sessions.get(session_id)
+        if session is not None:
+            session.validation_status = "cancelled"
+            session.status = "cancelled"
 
         await send_system_log(websocket, "validation_cancelled",
                              "User cancelled validation process",
@@ -356,39 +645,42 @@ async def cancel_validation(websocket: WebSocket, session_id: str):
 async def generate_final_complete_input(websocket: WebSocket, session_id: str):
     """Generate final Complete Input with validated CP/ATP"""
     try:
-        if session_id not in manager.user_sessions:
+        session = manager.user_sessions.get(session_id)
+        if session is None:
             return
 
-        session_data = manager.user_sessions[session_id]
-        validated_cp = session_data.get("validated_cp", "")
-        validated_atp = session_data.get("validated_atp", "")
-        original_input = session_data.get("original_input", {})
+        request = session.request
+        if request is None:
+            await send_system_log(websocket, "final_generation_error",
+                                 "Original input not found",
+                                 {"session_id": session_id})
+            return
 
         # Create Complete Input with validated content
         complete_input = {
             "basic_info": {
-                "nama_guru": original_input.get("nama_guru", ""),
-                "nama_sekolah": original_input.get("nama_sekolah", ""),
-                "mata_pelajaran": original_input.get("mata_pelajaran", ""),
-                "kelas": original_input.get("kelas", ""),
-                "fase": original_input.get("fase", ""),
-                "topik": original_input.get("topik", ""),
-                "sub_topik": original_input.get("sub_topik", ""),
-                "alokasi_waktu": original_input.get("alokasi_waktu", "")
+                "nama_guru": request.nama_guru,
+                "nama_sekolah": request.nama_sekolah,
+                "mata_pelajaran": request.mata_pelajaran,
+                "kelas": request.kelas,
+                "fase": request.fase,
+                "topik": request.topik,
+                "sub_topik": request.sub_topik,
+                "alokasi_waktu": request.alokasi_waktu
             },
             "curriculum_content": {
-                "cp": validated_cp,
-                "atp": validated_atp
+                "cp": session.validated_cp,
+                "atp": session.validated_atp
             },
             "technical_info": {
-                "llm_model": original_input.get("llm_model_choice", "gemini-1.5-flash"),
-                "timestamp": datetime.now().isoformat(),
+                "llm_model": request.llm_model_choice,
+                "timestamp": datetime.now(),
                 "status": "complete"
             },
             "metadata": {
                 "completeness_status": "user_validated",
                 "validation_approved": True,
-                "model_used": original_input.get("llm_model_choice", "gemini-1.5-flash")
+                "model_used": request.llm_model_choice
             }
         }
 
@@ -402,7 +694,7 @@ async def generate_final_complete_input(websocket: WebSocket, session_id: str):
         }, stage="final")
 
         # Update session status
-        manager.user_sessions[session_id]["status"] = "completed"
+        session.status = "completed"
 
     except Exception as e:
         logger.error(f"Error generating final Complete Input: {str(e)}")
@@ -410,80 +702,115 @@ async def generate_final_complete_input(websocket: WebSocket, session_id: str):
                              f"Error generating final Complete Input: {str(e)}",
                              {"session_id": session_id})
 
-async def send_session_status(websocket: WebSocket, session_id: str):
+async def send_session_status(websocket: WebSocket, session_id: str, data: Dict[str, Any] = None):
     """Send current session status"""
-    if session_id in manager.user_sessions:
-        status_data = manager.user_sessions[session_id]
+    session = manager.user_sessions.get(session_id)
+    if session is not None:
+        status_data = session
     else:
         status_data = {"status": "not_found"}
 
     await send_websocket_response(websocket, "session_status", status_data)
 
-async def send_websocket_response(websocket: WebSocket, response_type: str, data: Dict[str, Any]):
-    """Send formatted response via WebSocket"""
-    response = {
+def encode_websocket_response(websocket: WebSocket, response_type: str, data: Dict[str, Any]) -> bytes:
+    """Encode response frame sesuai wire format connection"""
+    timestamp = datetime.now()
+    if _is_msgpack(websocket):
+        return _MSGPACK_ENCODER.encode(WSResponse(type=response_type, data=data, timestamp=timestamp))
+    return _dump_json({
         "type": response_type,
         "data": data,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": timestamp
+    })
+
+def build_system_log(websocket: WebSocket, log_type: str, message: str,
+                     metadata: Dict[str, Any] = None) -> Union[SystemLog, Dict[str, Any]]:
+    """Buat entry system log sesuai wire format connection (belum di-encode)"""
+    timestamp = datetime.now()
+    if _is_msgpack(websocket):
+        return SystemLog(type=log_type, message=message, metadata=metadata or {}, timestamp=timestamp)
+    return {
+        "category": "system_log",
+        "type": log_type,
+        "message": message,
+        "metadata": metadata or {},
+        "timestamp": timestamp
     }
 
+def encode_system_log(websocket: WebSocket, log_type: str, message: str, metadata: Dict[str, Any] = None) -> bytes:
+    """Encode system log frame sesuai wire format connection"""
+    entry = build_system_log(websocket, log_type, message, metadata)
+    if _is_msgpack(websocket):
+        return _MSGPACK_ENCODER.encode(entry)
+    return _dump_json(entry)
+
+def encode_content_result(websocket: WebSocket, result_type: str, content: Dict[str, Any], stage: str = None) -> bytes:
+    """Encode content result frame sesuai wire format connection"""
+    timestamp = datetime.now()
+    if _is_msgpack(websocket):
+        return _MSGPACK_ENCODER.encode(
+            ContentResult(type=result_type, stage=stage, content=content, timestamp=timestamp)
+        )
+    return _dump_json({
+        "category": "content_result",
+        "type": result_type,
+        "stage": stage,
+        "content": content,
+        "timestamp": timestamp
+    })
+
+def encode_content_stream(websocket: WebSocket, stream_type: str, delta: str) -> bytes:
+    """Encode content stream frame sesuai wire format connection"""
+    timestamp = datetime.now()
+    if _is_msgpack(websocket):
+        return _MSGPACK_ENCODER.encode(ContentStream(type=stream_type, delta=delta, timestamp=timestamp))
+    return _dump_json({
+        "category": "content_stream",
+        "type": stream_type,
+        "delta": delta,
+        "timestamp": timestamp
+    })
+
+async def send_websocket_response(websocket: WebSocket, response_type: str, data: Dict[str, Any]):
+    """Send formatted response via WebSocket"""
     try:
-        # Custom JSON serialization to handle enums
-        def json_serializer(obj):
-            if hasattr(obj, 'value'):  # Enum objects
-                return obj.value
-            if hasattr(obj, '__dict__'):  # Complex objects
-                return obj.__dict__
-            return str(obj)
-
-        await websocket.send_text(json.dumps(response, default=json_serializer))
+        manager.enqueue_frame(websocket, encode_websocket_response(websocket, response_type, data))
     except Exception as e:
         logger.error(f"Failed to send WebSocket response: {str(e)}")
 
 async def send_system_log(websocket: WebSocket, log_type: str, message: str, metadata: Dict[str, Any] = None):
     """Send system log message via WebSocket"""
-    response = {
-        "category": "system_log",
-        "type": log_type,
-        "message": message,
-        "metadata": metadata or {},
-        "timestamp": datetime.now().isoformat()
-    }
-
     try:
-        def json_serializer(obj):
-            if hasattr(obj, 'value'):
-                return obj.value
-            if hasattr(obj, '__dict__'):
-                return obj.__dict__
-            return str(obj)
-
-        await websocket.send_text(json.dumps(response, default=json_serializer))
+        # Entry di-encode oleh relay, sehingga log berurutan bisa digabung satu frame
+        manager.enqueue_log(websocket, build_system_log(websocket, log_type, message, metadata))
     except Exception as e:
         logger.error(f"Failed to send system log: {str(e)}")
 
 async def send_content_result(websocket: WebSocket, result_type: str, content: Dict[str, Any], stage: str = None):
     """Send content generation result via WebSocket"""
-    response = {
-        "category": "content_result",
-        "type": result_type,
-        "stage": stage,
-        "content": content,
-        "timestamp": datetime.now().isoformat()
-    }
-
     try:
-        def json_serializer(obj):
-            if hasattr(obj, 'value'):
-                return obj.value
-            if hasattr(obj, '__dict__'):
-                return obj.__dict__
-            return str(obj)
-
-        await websocket.send_text(json.dumps(response, default=json_serializer))
+        manager.enqueue_frame(websocket, encode_content_result(websocket, result_type, content, stage))
     except Exception as e:
         logger.error(f"Failed to send content result: {str(e)}")
 
+async def send_content_stream(websocket: WebSocket, stream_type: str, delta: str):
+    """Send potongan text CP/ATP yang sedang di-generate via WebSocket"""
+    try:
+        manager.enqueue_frame(websocket, encode_content_stream(websocket, stream_type, delta))
+    except Exception as e:
+        logger.error(f"Failed to send content stream: {str(e)}")
+
+# Dispatch table message struct -> handler(websocket, session_id, data)
+_HANDLERS = {
+    StartProcessingMessage: start_processing,
+    PingMessage: _handle_ping,
+    GetStatusMessage: send_session_status,
+    CancelProcessingMessage: cancel_processing,
+    ApproveValidationMessage: approve_validation,
+    RegenerateContentMessage: regenerate_content,
+    CancelValidationMessage: cancel_validation,
+}
+
 # WebSocket endpoint
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
@@ -503,25 +830,35 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
             ]
         })
 
+        binary = _is_msgpack(websocket)
+
         # Message handling loop
         while True:
             # Receive message
-            data = await websocket.receive_text()
-
             try:
-                message = json.loads(data)
-                await handle_websocket_message(websocket, session_id, message)
-            except json.JSONDecodeError:
+                if binary:
+                    message = _MSGPACK_DECODER.decode(await websocket.receive_bytes())
+                else:
+                    message = _JSON_DECODER.decode(await websocket.receive_text())
+            except msgspec.ValidationError as e:
                 await send_websocket_response(websocket, "error", {
-                    "message": "Invalid JSON format"
+                    "message": f"Invalid message: {str(e)}"
                 })
+                continue
+            except msgspec.DecodeError:
+                await send_websocket_response(websocket, "error", {
+                    "message": "Invalid MessagePack format" if binary else "Invalid JSON format"
+                })
+                continue
+
+            await handle_websocket_message(websocket, session_id, message)
 
     except WebSocketDisconnect:
-        manager.disconnect(session_id)
+        manager.disconnect(session_id, websocket)
         logger.info(f"WebSocket disconnected: {session_id}")
     except Exception as e:
         logger.error(f"WebSocket error for {session_id}: {str(e)}")
-        manager.disconnect(session_id)
+        manager.disconnect(session_id, websocket)
 
 # REST API endpoints for monitoring
 @app.get("/")
@@ -533,7 +870,7 @@ async def root():
         "description": "Real-time Orchestrated RAG dengan WebSocket",
         "websocket_endpoint": "/ws/{session_id}",
         "active_connections": len(manager.active_connections),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
     }
 
 @app.get("/health")
@@ -548,7 +885,7 @@ async def health_check():
                 "websocket_manager": "available",
                 "active_connections": len(manager.active_connections)
             },
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
         return health_status
@@ -561,12 +898,12 @@ async def get_active_sessions():
     """Get information tentang active sessions"""
     sessions_info = []
 
-    for session_id, session_data in manager.user_sessions.items():
+    for session_id, session in manager.user_sessions.items():
         sessions_info.append({
             "session_id": session_id,
-            "status": session_data.get("status", "unknown"),
-            "connected_at": session_data.get("connected_at", ""),
-            "current_process": session_data.get("current_process"),
+            "status": session.status,
+            "connected_at": session.connected_at,
+            "current_process": session.current_process,
             "has_websocket": session_id in manager.active_connections
         })
 
@@ -581,476 +918,24 @@ async def get_session_info(session_id: str):
     if session_id not in manager.user_sessions:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session_data = manager.user_sessions[session_id]
-    session_data["has_websocket"] = session_id in manager.active_connections
+    session_data = msgspec.to_builtins(manager.user_sessions[session_id])
+    websocket = manager.active_connections.get(session_id)
+    session_data["has_websocket"] = websocket is not None
+    if websocket is not None:
+        queue = manager.send_queues.get(session_id)
+        session_data["send_queue_depth"] = queue.qsize() if queue is not None else 0
+        session_data["dropped_logs"] = websocket.state.dropped_logs
 
     return session_data
 
 # HTML client untuk testing (optional)
-@app.get("/client", response_class=HTMLResponse)
-async def websocket_client():
-    """Simple HTML client untuk testing WebSocket"""
-    html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>RAG Orchestra WebSocket Client</title>
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        .container { max-width: 800px; margin: 0 auto; }
-        .messages {
-            height: 400px;
-            border: 1px solid #ccc;
-            padding: 10px;
-            overflow-y: scroll;
-            background-color: #f9f9f9;
-            margin-bottom: 10px;
-            font-family: 'Courier New', monospace;
-            font-size: 12px;
-        }
-        .input-group { margin-bottom: 10px; }
-        .input-group label { display: block; margin-bottom: 5px; }
-        .input-group input, .input-group select, .input-group textarea {
-            width: 100%;
-            padding: 5px;
-            box-sizing: border-box;
-        }
-        button {
-            padding: 10px 20px;
-            margin: 5px;
-            cursor: pointer;
-        }
-        .status {
-            padding: 10px;
-            margin: 10px 0;
-            border-radius: 4px;
-        }
-        .status.connected { background-color: #d4edda; color: #155724; }
-        .status.disconnected { background-color: #f8d7da; color: #721c24; }
-
-        /* System Log Styling */
-        .error { color: #dc3545; font-weight: bold; }
-        .success { color: #28a745; font-weight: bold; }
-        .info { color: #007bff; font-weight: bold; }
-        .default { color: #6c757d; font-weight: bold; }
-
-        /* Content Result Styling */
-        .content-result {
-            color: #fd7e14;
-            font-weight: bold;
-            background-color: #fff3cd;
-            padding: 2px 4px;
-            border-radius: 3px;
-        }
-
-        /* Modal Styling */
-        .modal {
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0,0,0,0.5);
-        }
-        .modal-content {
-            background-color: white;
-            margin: 5% auto;
-            padding: 20px;
-            border-radius: 8px;
-            width: 80%;
-            max-width: 800px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }
-        .modal-buttons {
-            text-align: center;
-            margin-top: 20px;
-        }
-        .modal-buttons button {
-            margin: 0 10px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>RAG Orchestra WebSocket Client</h1>
-
-        <div id="status" class="status disconnected">Disconnected</div>
-
-        <div class="messages" id="messages"></div>
-
-        <div class="input-group">
-            <label>Session ID:</label>
-            <input type="text" id="sessionId" placeholder="Enter session ID (auto-generated if empty)">
-        </div>
-
-        <button onclick="connect()">Connect</button>
-        <button onclick="disconnect()">Disconnect</button>
-        <button onclick="ping()">Ping</button>
-
-        <h3>Start Processing</h3>
-
-        <div class="input-group">
-            <label>Nama Guru:</label>
-            <input type="text" id="namaGuru" value="Budi Santoso">
-        </div>
-
-        <div class="input-group">
-            <label>Nama Sekolah:</label>
-            <input type="text" id="namaSekolah" value="SDN 1 Jakarta">
-        </div>
-
-        <div class="input-group">
-            <label>Mata Pelajaran:</label>
-            <select id="mataPelajaran">
-                <option>Matematika</option>
-                <option>Bahasa Indonesia</option>
-                <option>IPA</option>
-                <option>IPS</option>
-                <option>Bahasa Inggris</option>
-            </select>
-        </div>
-
-        <div class="input-group">
-            <label>Kelas:</label>
-            <select id="kelas">
-                <option>1</option>
-                <option>2</option>
-                <option>3</option>
-                <option>4</option>
-                <option>5</option>
-                <option>6</option>
-            </select>
-        </div>
-
-        <div class="input-group">
-            <label>Fase:</label>
-            <select id="fase">
-                <option>A</option>
-                <option>B</option>
-                <option>C</option>
-            </select>
-        </div>
-
-        <div class="input-group">
-            <label>Topik:</label>
-            <input type="text" id="topik" value="Penjumlahan">
-        </div>
-
-        <div class="input-group">
-            <label>Sub Topik:</label>
-            <input type="text" id="subTopik" value="Penjumlahan bilangan 1-10">
-        </div>
-
-        <div class="input-group">
-            <label>Alokasi Waktu:</label>
-            <input type="text" id="alokasiWaktu" value="2 x 35 menit">
-        </div>
-
-        <div class="input-group">
-            <label>LLM Model:</label>
-            <select id="llmModel">
-                <option value="gemini-1.5-flash">Gemini 1.5 Flash</option>
-                <option value="gemini-1.5-pro">Gemini 1.5 Pro</option>
-                <option value="gpt-4">GPT-4</option>
-                <option value="gpt-3.5-turbo">GPT-3.5 Turbo</option>
-            </select>
-        </div>
-
-        <h4>Optional: Capaian Pembelajaran & Alur Tujuan Pembelajaran</h4>
-        <p><em>Kosongkan jika ingin sistem generate otomatis</em></p>
-
-        <div class="input-group">
-            <label>CP (Capaian Pembelajaran):</label>
-            <textarea id="cp" rows="4" placeholder="Masukkan CP jika sudah ada, atau kosongkan untuk auto-generate"></textarea>
-        </div>
-
-        <div class="input-group">
-            <label>ATP (Alur Tujuan Pembelajaran):</label>
-            <textarea id="atp" rows="4" placeholder="Masukkan ATP jika sudah ada, atau kosongkan untuk auto-generate"></textarea>
-        </div>
-
-        <button onclick="startProcessing()">Start Processing</button>
-        <button onclick="cancelProcessing()">Cancel Processing</button>
-        <button onclick="getStatus()">Get Status</button>
-
-        <!-- Validation Modal -->
-        <div id="validationModal" class="modal" style="display: none;">
-            <div class="modal-content">
-                <h3>Validasi CP/ATP yang Dihasilkan</h3>
-                <p>Sistem telah menghasilkan CP dan ATP. Silakan review dan edit jika diperlukan:</p>
-
-                <div class="input-group">
-                    <label>CP (Capaian Pembelajaran):</label>
-                    <textarea id="validationCP" rows="6"></textarea>
-                </div>
-
-                <div class="input-group">
-                    <label>ATP (Alur Tujuan Pembelajaran):</label>
-                    <textarea id="validationATP" rows="6"></textarea>
-                </div>
-
-                <div class="modal-buttons">
-                    <button onclick="approveValidation()">Approve & Continue</button>
-                    <button onclick="regenerateContent()">Regenerate</button>
-                    <button onclick="cancelValidation()">Cancel</button>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let ws = null;
-        let sessionId = null;
-
-        function log(message) {
-            const messages = document.getElementById('messages');
-            const timestamp = new Date().toLocaleTimeString();
-            messages.innerHTML += `[${timestamp}] ${message}\\n`;
-            messages.scrollTop = messages.scrollHeight;
-        }
+@app.get("/client", response_class=Response)
+async def get_client():
+    return Response(content=CLIENT_HTML_BYTES, media_type="text/html")
 
-        function updateStatus(connected) {
-            const statusEl = document.getElementById('status');
-            if (connected) {
-                statusEl.textContent = `Connected (Session: ${sessionId})`;
-                statusEl.className = 'status connected';
-            } else {
-                statusEl.textContent = 'Disconnected';
-                statusEl.className = 'status disconnected';
-            }
-        }
-
-        function connect() {
-            sessionId = document.getElementById('sessionId').value ||
-                       'session_' + Math.random().toString(36).substr(2, 9);
-
-            const wsUrl = `ws://localhost:8000/ws/${sessionId}`;
-            ws = new WebSocket(wsUrl);
-
-            ws.onopen = function() {
-                log('WebSocket connected');
-                updateStatus(true);
-            };
-
-            ws.onmessage = function(event) {
-                const message = JSON.parse(event.data);
-
-                // Handle different message categories
-                if (message.category === 'system_log') {
-                    logSystemMessage(message);
-                } else if (message.category === 'content_result') {
-                    logContentResult(message);
-                } else {
-                    // Legacy support for old format
-                    log(`Received: ${message.type} - ${JSON.stringify(message.data, null, 2)}`);
-                }
-            };
-
-        function logSystemMessage(message) {
-            const messages = document.getElementById('messages');
-            const timestamp = new Date(message.timestamp).toLocaleTimeString();
-            const logClass = getLogClass(message.type);
-
-            messages.innerHTML += `[${timestamp}] <span class="${logClass}">SYSTEM</span> ${message.message}\\n`;
-
-            if (Object.keys(message.metadata).length > 0) {
-                messages.innerHTML += `    └─ Metadata: ${JSON.stringify(message.metadata, null, 2)}\\n`;
-            }
-
-            messages.scrollTop = messages.scrollHeight;
-        }
-
-        function logContentResult(message) {
-            const messages = document.getElementById('messages');
-            const timestamp = new Date(message.timestamp).toLocaleTimeString();
-
-            messages.innerHTML += `[${timestamp}] <span class="content-result">CONTENT</span> ${message.type}\\n`;
-
-            if (message.stage) {
-                messages.innerHTML += `    └─ Stage: ${message.stage}\\n`;
-            }
-
-            // Check if this requires validation
-            if (message.type === 'cp_atp_generated' && message.content.requires_validation) {
-                showValidationModal(
-                    message.content.generated_cp,
-                    message.content.generated_atp,
-                    message.content.session_id
-                );
-                messages.innerHTML += `    └─ ⚠️ User validation required\\n`;
-            } else {
-                // Format content nicely for other types
-                if (message.content) {
-                    const contentStr = JSON.stringify(message.content, null, 2);
-                    const truncated = contentStr.length > 500 ?
-                        contentStr.substring(0, 500) + '...' : contentStr;
-                    messages.innerHTML += `    └─ Content: ${truncated}\\n`;
-                }
-            }
-
-            messages.scrollTop = messages.scrollHeight;
-        }
-
-        function getLogClass(type) {
-            if (type.includes('error')) return 'error';
-            if (type.includes('complete')) return 'success';
-            if (type.includes('start')) return 'info';
-            return 'default';
-        }
-
-            ws.onclose = function() {
-                log('WebSocket disconnected');
-                updateStatus(false);
-            };
-
-            ws.onerror = function(error) {
-                log(`WebSocket error: ${error}`);
-            };
-        }
-
-        function disconnect() {
-            if (ws) {
-                ws.close();
-            }
-        }
-
-        function ping() {
-            if (ws) {
-                ws.send(JSON.stringify({
-                    type: 'ping',
-                    data: {}
-                }));
-            }
-        }
-
-        function startProcessing() {
-            if (!ws) {
-                alert('Please connect first');
-                return;
-            }
-
-            const data = {
-                nama_guru: document.getElementById('namaGuru').value,
-                nama_sekolah: document.getElementById('namaSekolah').value,
-                mata_pelajaran: document.getElementById('mataPelajaran').value,
-                kelas: document.getElementById('kelas').value,
-                fase: document.getElementById('fase').value,
-                topik: document.getElementById('topik').value,
-                sub_topik: document.getElementById('subTopik').value,
-                alokasi_waktu: document.getElementById('alokasiWaktu').value,
-                llm_model_choice: document.getElementById('llmModel').value,
-                cp: document.getElementById('cp').value || null,
-                atp: document.getElementById('atp').value || null
-            };
-
-            ws.send(JSON.stringify({
-                type: 'start_processing',
-                data: data
-            }));
-        }
-
-        function cancelProcessing() {
-            if (ws) {
-                ws.send(JSON.stringify({
-                    type: 'cancel_processing',
-                    data: {}
-                }));
-            }
-        }
-
-        function getStatus() {
-            if (ws) {
-                ws.send(JSON.stringify({
-                    type: 'get_status',
-                    data: {}
-                }));
-            }
-        }
-
-        // Global variables for validation
-        let pendingValidation = null;
-        let currentSessionForValidation = null;
-
-        // Show validation modal when CP/ATP generation is complete
-        function showValidationModal(cpContent, atpContent, sessionId) {
-            pendingValidation = { cp: cpContent, atp: atpContent };
-            currentSessionForValidation = sessionId;
-
-            document.getElementById('validationCP').value = cpContent;
-            document.getElementById('validationATP').value = atpContent;
-            document.getElementById('validationModal').style.display = 'block';
-        }
-
-        // Approve validation and continue processing
-        function approveValidation() {
-            if (!ws || !currentSessionForValidation) return;
-
-            const validatedCP = document.getElementById('validationCP').value;
-            const validatedATP = document.getElementById('validationATP').value;
-
-            ws.send(JSON.stringify({
-                type: 'approve_validation',
-                data: {
-                    session_id: currentSessionForValidation,
-                    validated_cp: validatedCP,
-                    validated_atp: validatedATP
-                }
-            }));
-
-            closeValidationModal();
-        }
-
-        // Request regeneration of CP/ATP
-        function regenerateContent() {
-            if (!ws || !currentSessionForValidation) return;
-
-            ws.send(JSON.stringify({
-                type: 'regenerate_content',
-                data: {
-                    session_id: currentSessionForValidation
-                }
-            }));
-
-            closeValidationModal();
-        }
-
-        // Cancel validation process
-        function cancelValidation() {
-            if (!ws || !currentSessionForValidation) return;
-
-            ws.send(JSON.stringify({
-                type: 'cancel_validation',
-                data: {
-                    session_id: currentSessionForValidation
-                }
-            }));
-
-            closeValidationModal();
-        }
-
-        // Close validation modal
-        function closeValidationModal() {
-            document.getElementById('validationModal').style.display = 'none';
-            pendingValidation = null;
-            currentSessionForValidation = null;
-        }
-
-        // Update message handling to trigger validation
-        function handleValidationTrigger(message) {
-            if (message.type === 'cp_atp_generated' && message.data.requires_validation) {
-                showValidationModal(
-                    message.data.generated_cp,
-                    message.data.generated_atp,
-                    message.data.session_id
-                );
-            }
-        }
-    </script>
-</body>
-</html>
-    """
-    return HTMLResponse(content=html_content)
+@app.get("/client/msgpack.js", response_class=Response)
+async def get_client_msgpack():
+    return Response(content=CLIENT_MSGPACK_JS_BYTES, media_type="text/javascript")
 
 if __name__ == "__main__":
     import uvicorn
@@ -1062,5 +947,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop=event_loop.UVICORN_LOOP,
         log_level="info"
     )
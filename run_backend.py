@@ -9,14 +9,35 @@ Menjalankan FastAPI server dengan Uvicorn
 import uvicorn
 import sys
 import os
-from pathlib import Path
-
-# Add src to Python path
-sys.path.insert(0, str(Path(__file__).parent))
 
 from src.api.main import app
+from src.utils import event_loop
 from src.utils.logger import get_logger
 
+try:
+    import httptools  # noqa: F401  C HTTP parser, terinstall via uvicorn[standard]
+    UVICORN_HTTP = "httptools"
+except ImportError:
+    UVICORN_HTTP = "h11"
+
+# High-water mark write buffer per WebSocket; default asyncio (64 KiB) memaksa
+# drain() hampir tiap frame saat burst status/log kecil
+WS_WRITE_LIMIT = int(os.getenv("WS_WRITE_LIMIT", str(1 << 20)))
+
+try:
+    from uvicorn.protocols.websockets.websockets_impl import WebSocketProtocol
+
+    class BufferedWebSocketProtocol(WebSocketProtocol):
+        """WebSocket protocol uvicorn dengan write buffer limit WS_WRITE_LIMIT"""
+
+        def connection_made(self, transport):
+            super().connection_made(transport)
+            transport.set_write_buffer_limits(high=WS_WRITE_LIMIT)
+
+    UVICORN_WS = BufferedWebSocketProtocol
+except ImportError:
+    UVICORN_WS = "websockets"
+
 logger = get_logger("BackendServer")
 
 def main():
@@ -25,16 +46,26 @@ def main():
     # Configuration
     host = os.getenv("HOST", "127.0.0.1")
     port = int(os.getenv("PORT", "8000"))
-    workers = int(os.getenv("WORKERS", "1"))
+    # WORKERS=auto memakai semua core. Multi-worker belum didukung: session state
+    # (SessionManager) dan WebSocket connections disimpan per-process, sehingga
+    # request sebuah session harus selalu sampai ke worker yang sama
+    workers_env = os.getenv("WORKERS", "1")
+    workers = (os.cpu_count() or 1) if workers_env.lower() == "auto" else int(workers_env)
     reload = os.getenv("RELOAD", "true").lower() == "true"
     log_level = os.getenv("LOG_LEVEL", "info")
+    # Access log memformat string per request; default hanya aktif saat development
+    access_log = os.getenv("ACCESS_LOG", "true" if reload else "false").lower() == "true"
+    ws_max_size = int(os.getenv("WS_MAX_MESSAGE_SIZE", "1048576"))
 
     logger.info(f"Starting RAG Multi-Strategy Backend Server...")
     logger.info(f"Host: {host}")
     logger.info(f"Port: {port}")
     logger.info(f"Workers: {workers}")
+    if workers > 1 and not reload:
+        logger.warning("WORKERS > 1: session state tidak dibagi antar worker, session bisa hilang")
     logger.info(f"Reload: {reload}")
     logger.info(f"Log Level: {log_level}")
+    logger.info(f"Event Loop: {event_loop.UVICORN_LOOP}, HTTP: {UVICORN_HTTP}")
 
     try:
         # Run server
@@ -45,7 +76,11 @@ def main():
             workers=workers if not reload else 1,  # Workers > 1 doesn't work with reload
             reload=reload,
             log_level=log_level,
-            access_log=True,
+            access_log=access_log,
+            loop=event_loop.UVICORN_LOOP,
+            http=UVICORN_HTTP,
+            ws=UVICORN_WS,
+            ws_max_size=ws_max_size,
             reload_dirs=["src"] if reload else None
         )
 
@@ -16,34 +16,35 @@ import subprocess
 import shutil
 from pathlib import Path
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-def run_command(command: str, description: str = "") -> bool:
-    """Run command dengan error handling"""
+def run_command(command: List[str], description: str = "") -> bool:
+    """Run command (argv list) dan stream output-nya secara langsung"""
     if description:
         print(f"\n🔧 {description}")
 
-    print(f"Running: {command}")
+    print(f"Running: {subprocess.list2cmdline(command)}")
 
     try:
-        result = subprocess.run(
+        # Tanpa shell dan tanpa buffer output penuh di memory
+        with subprocess.Popen(
             command,
-            shell=True,
-            check=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True
-        )
+        ) as proc:
+            for line in proc.stdout:
+                print(line, end='')
 
-        if result.stdout:
-            print(result.stdout)
+        if proc.returncode != 0:
+            print(f"❌ Error: command exited with status {proc.returncode}")
+            return False
 
         print("✅ Success")
         return True
 
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         print(f"❌ Error: {e}")
-        if e.stderr:
-            print(f"Error details: {e.stderr}")
         return False
 
 def check_python_version():
@@ -65,7 +66,7 @@ def install_dependencies():
     print("\n📦 Installing Python dependencies...")
 
     # Update pip first
-    if not run_command(f"{sys.executable} -m pip install --upgrade pip", "Updating pip"):
+    if not run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], "Updating pip"):
         return False
 
     # Install requirements
@@ -76,7 +77,8 @@ def install_dependencies():
 
     for req_file in requirements_files:
         if Path(req_file).exists():
-            if run_command(f"{sys.executable} -m pip install -r {req_file}", f"Installing from {req_file}"):
+            if run_command([sys.executable, "-m", "pip", "install", "--prefer-binary", "-r", req_file],
+                           f"Installing from {req_file}"):
                 return True
 
     # Fallback: install essential packages manually
@@ -100,9 +102,10 @@ def install_dependencies():
         "rich>=13.7.0"
     ]
 
-    for package in essential_packages:
-        if not run_command(f"{sys.executable} -m pip install {package}", f"Installing {package}"):
-            print(f"⚠️ Failed to install {package}, continuing...")
+    # Satu invocation pip: sekali startup dan satu resolver pass untuk semua package
+    if not run_command([sys.executable, "-m", "pip", "install", "--prefer-binary", *essential_packages],
+                       "Installing essential packages"):
+        print("⚠️ Failed to install essential packages, continuing...")
 
     return True
 
@@ -121,13 +124,10 @@ def create_directories():
         "outputs"
     ]
 
+    # exist_ok menggantikan pengecekan exists() terpisah per directory
     for directory in directories:
-        dir_path = Path(directory)
-        if not dir_path.exists():
-            dir_path.mkdir(parents=True, exist_ok=True)
-            print(f"✅ Created: {directory}")
-        else:
-            print(f"📁 Exists: {directory}")
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    print(f"✅ Ensured: {', '.join(directories)}")
 
     return True
 
@@ -235,7 +235,7 @@ def create_config_files():
         config_dir.mkdir(exist_ok=True)
 
         with open(config_dir / "logging_config.json", 'w', encoding='utf-8') as f:
-            json.dump(logging_config, f, indent=2)
+            json.dump(logging_config, f, separators=(',', ':'))
 
         print("✅ Created logging configuration")
 
@@ -267,7 +267,7 @@ def create_config_files():
         }
 
         with open(config_dir / "orchestrator_config.json", 'w', encoding='utf-8') as f:
-            json.dump(orchestrator_config, f, indent=2)
+            json.dump(orchestrator_config, f, separators=(',', ':'))
 
         print("✅ Created orchestrator configuration")
         return True
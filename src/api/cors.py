@@ -0,0 +1,101 @@
+"""
+CORS Middleware
+===============
+
+ASGI middleware CORS ringan untuk allowlist origin statis. Origin dicek
+dengan satu lookup frozenset, dan response preflight (header statis)
+di-build sekali saat startup lalu dikirim langsung tanpa memanggil app.
+"""
+
+from typing import Iterable, List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PREFLIGHT_MAX_AGE = 600
+
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+_PREFLIGHT_BODY = b"OK"
+_DISALLOWED_BODY = b"Disallowed CORS origin"
+
+class StaticCORSMiddleware:
+    """CORS untuk allowlist statis; "*" mengizinkan semua origin"""
+
+    def __init__(self, app: ASGIApp, allow_origins: Iterable[str] = ("*",),
+                 allow_credentials: bool = True):
+        self.app = app
+        origins = [origin.strip() for origin in allow_origins if origin.strip()]
+        self.allow_all = "*" in origins
+        self.allowed_origins = frozenset(origin.encode("latin-1") for origin in origins)
+        self.allow_credentials = allow_credentials
+
+        # Header yang sama untuk setiap response; origin selalu di-echo agar
+        # tetap valid saat credentials diizinkan
+        self.simple_headers: List[Tuple[bytes, bytes]] = []
+        if allow_credentials:
+            self.simple_headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers: List[Tuple[bytes, bytes]] = self.simple_headers + [
+            (b"access-control-allow-methods", _ALLOW_METHODS),
+            (b"access-control-max-age", str(PREFLIGHT_MAX_AGE).encode()),
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(_PREFLIGHT_BODY)).encode()),
+            (b"vary", b"Origin"),
+        ]
+        self.disallowed_headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", str(len(_DISALLOWED_BODY)).encode()),
+            (b"vary", b"Origin"),
+        ]
+
+    def is_allowed(self, origin: bytes) -> bool:
+        return self.allow_all or origin in self.allowed_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self.preflight(origin, request_headers, send)
+            return
+
+        if not self.is_allowed(origin):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"access-control-allow-origin", origin))
+                headers.extend(self.simple_headers)
+                headers.append((b"vary", b"Origin"))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def preflight(self, origin: bytes, request_headers, send: Send):
+        """Kirim response preflight langsung tanpa masuk ke router"""
+        if not self.is_allowed(origin):
+            await send({"type": "http.response.start", "status": 400,
+                        "headers": self.disallowed_headers})
+            await send({"type": "http.response.body", "body": _DISALLOWED_BODY})
+            return
+
+        headers = [(b"access-control-allow-origin", origin), *self.preflight_headers]
+        if request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": _PREFLIGHT_BODY})
@@ -6,31 +6,61 @@ Main FastAPI application untuk RAG Multi-Strategy Backend
 Menyediakan REST API endpoints dan WebSocket untuk real-time interaction
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Depends, Request
+from fastapi.responses import ORJSONResponse, Response
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 import asyncio
-import json
+import time
 from datetime import datetime
+from operator import attrgetter
+
+import msgspec
+import orjson
 
 from ..schemas.api_schemas import (
     UserInputRequest, ValidationRequest, CPATPResponse,
     FinalInputResponse, TaskAnalysisResponse, WebSocketMessage,
     SessionCreateResponse, SessionStatusResponse, ConfigRequest
 )
-from ..services.session_manager import SessionManager, SessionStatusEnum, get_session_manager
+from ..services.session_manager import SessionManager, SessionState, SessionStatusEnum, get_session_manager
 from ..services.rag_processing_service import RAGProcessingService
-from ..core.models import UserInput, ValidationResult
+from .cors import StaticCORSMiddleware
+from ..core.models import ValidationResult
 from ..utils.logger import get_logger
+from config import envs
 
 logger = get_logger("FastAPI-App")
 
 # Global service instances
 session_manager: Optional[SessionManager] = None
 processing_service: Optional[RAGProcessingService] = None
-websocket_connections: Dict[str, List[WebSocket]] = {}
+websocket_connections: Dict[str, Set[WebSocket]] = {}
+
+_now_iso_cache = (0, "")
+
+def _now_iso() -> str:
+    """Timestamp ISO untuk response REST, di-format ulang paling banyak sekali per detik"""
+    global _now_iso_cache
+    second = int(time.time())
+    if _now_iso_cache[0] != second:
+        _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _now_iso_cache[1]
+
+# Binary protocol (MessagePack) untuk clients yang meminta subprotocol "msgpack"
+MSGPACK_SUBPROTOCOL = "msgpack"
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_MSGPACK_DECODER = msgspec.msgpack.Decoder(dict)
+
+def encode_ws_message(message: Dict[str, Any], binary: bool = False) -> bytes:
+    """Encode WebSocket message ke MessagePack atau JSON bytes (datetime di-format oleh encoder)"""
+    if binary:
+        return _MSGPACK_ENCODER.encode(message)
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS)
+
+async def send_ws_message(websocket: WebSocket, message: Dict[str, Any]):
+    """Send message sebagai binary frame sesuai wire format connection"""
+    await websocket.send_bytes(encode_ws_message(message, websocket.state.msgpack))
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -67,16 +97,15 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware (allowlist dari CORS_ORIGINS)
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure based on your needs
+    StaticCORSMiddleware,
+    allow_origins=envs.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
 )
 
 # === Dependency Functions ===
@@ -87,6 +116,16 @@ def get_session_manager() -> SessionManager:
         raise HTTPException(status_code=500, detail="Session manager not initialized")
     return session_manager
 
+def get_session_dep(
+    session_id: str,
+    session_mgr: SessionManager = Depends(get_session_manager)
+) -> SessionState:
+    """Resolve session dari path sekali per request, 404 jika tidak ada"""
+    session = session_mgr.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
 def get_processing_service() -> RAGProcessingService:
     """Get processing service instance"""
     if processing_service is None:
@@ -97,53 +136,89 @@ def get_processing_service() -> RAGProcessingService:
 
 async def broadcast_to_websockets(session_id: str, message: Dict[str, Any]):
     """Broadcast message to all WebSocket connections for a session"""
-    if session_id not in websocket_connections:
+    # Snapshot tuple: set bisa berubah selama send di-await
+    connections = tuple(websocket_connections.get(session_id, ()))
+    if not connections:
         return
 
-    connections = websocket_connections[session_id].copy()
-    message_json = json.dumps(message)
+    # Encode sekali per wire format, dipakai bersama oleh semua connection
+    frames: Dict[bool, bytes] = {}
+    sends = []
 
     for websocket in connections:
-        try:
-            await websocket.send_text(message_json)
-        except Exception as e:
-            logger.warning(f"Failed to send WebSocket message: {str(e)}")
+        binary = websocket.state.msgpack
+        frame = frames.get(binary)
+        if frame is None:
+            frame = frames[binary] = encode_ws_message(message, binary)
+        sends.append(websocket.send_bytes(frame))
+
+    # Kirim ke semua connection secara concurrent
+    results = await asyncio.gather(*sends, return_exceptions=True)
+
+    for websocket, result in zip(connections, results):
+        if isinstance(result, Exception):
+            logger.debug("Failed to send WebSocket message: %s", result)
             # Remove dead connection
-            if websocket in websocket_connections[session_id]:
-                websocket_connections[session_id].remove(websocket)
+            websocket_connections.get(session_id, set()).discard(websocket)
 
 def add_websocket_connection(session_id: str, websocket: WebSocket):
     """Add WebSocket connection to session"""
-    if session_id not in websocket_connections:
-        websocket_connections[session_id] = []
-    websocket_connections[session_id].append(websocket)
+    websocket_connections.setdefault(session_id, set()).add(websocket)
 
 def remove_websocket_connection(session_id: str, websocket: WebSocket):
     """Remove WebSocket connection from session"""
     if session_id in websocket_connections:
-        if websocket in websocket_connections[session_id]:
-            websocket_connections[session_id].remove(websocket)
+        websocket_connections[session_id].discard(websocket)
         if not websocket_connections[session_id]:
             del websocket_connections[session_id]
 
 # === REST API Endpoints ===
 
+# Envelope JSON statis untuk "/" dan "/api/health" di-encode sekali saat import;
+# per request hanya placeholder "__NAME__" yang diganti dengan value ter-encode
+def _fill_json_template(template: bytes, **values: Any) -> Response:
+    """Ganti placeholder "__NAME__" di template dengan value yang di-encode orjson"""
+    for name, value in values.items():
+        template = template.replace(
+            b'"__' + name.encode() + b'__"',
+            orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        )
+    return Response(content=template, media_type="application/json")
+
+ROOT_TEMPLATE = orjson.dumps({
+    "message": "RAG Multi-Strategy Backend API",
+    "version": "1.0.0",
+    "status": "running",
+    "timestamp": "__timestamp__",
+    "endpoints": {
+        "docs": "/docs",
+        "redoc": "/redoc",
+        "websocket": "/ws/{session_id}",
+        "sessions": "/api/sessions",
+        "health": "/api/health"
+    }
+})
+
+HEALTH_TEMPLATE = orjson.dumps({
+    "status": "healthy",
+    "timestamp": "__timestamp__",
+    "services": {
+        "session_manager": {
+            "status": "running",
+            "stats": "__session_stats__"
+        },
+        "processing_service": {
+            "status": "running",
+            "stats": "__service_stats__"
+        }
+    },
+    "websocket_connections": "__websocket_connections__"
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with API info"""
-    return {
-        "message": "RAG Multi-Strategy Backend API",
-        "version": "1.0.0",
-        "status": "running",
-        "timestamp": datetime.now().isoformat(),
-        "endpoints": {
-            "docs": "/docs",
-            "redoc": "/redoc",
-            "websocket": "/ws/{session_id}",
-            "sessions": "/api/sessions",
-            "health": "/api/health"
-        }
-    }
+    return _fill_json_template(ROOT_TEMPLATE, timestamp=_now_iso())
 
 @app.get("/api/health")
 async def health_check(
@@ -151,24 +226,13 @@ async def health_check(
     proc_service: RAGProcessingService = Depends(get_processing_service)
 ):
     """Health check endpoint"""
-    service_stats = proc_service.get_service_stats()
-    session_stats = session_mgr.get_stats()
-
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "services": {
-            "session_manager": {
-                "status": "running",
-                "stats": session_stats
-            },
-            "processing_service": {
-                "status": "running",
-                "stats": service_stats
-            }
-        },
-        "websocket_connections": len(websocket_connections)
-    }
+    return _fill_json_template(
+        HEALTH_TEMPLATE,
+        timestamp=_now_iso(),
+        session_stats=session_mgr.get_stats(),
+        service_stats=proc_service.get_service_stats(),
+        websocket_connections=len(websocket_connections)
+    )
 
 @app.post("/api/sessions", response_model=SessionCreateResponse)
 async def create_session(
@@ -189,29 +253,25 @@ async def create_session(
         session_id = await session_mgr.create_session(user_id)
         session = session_mgr.get_session(session_id)
 
-        logger.info(f"New session created: {session_id}")
+        logger.info("New session created: %s", session_id)
 
         return SessionCreateResponse(
             session_id=session.session_id,
             status=session.status,
-            created_at=session.created_at.isoformat(),
+            created_at=session.created_at_iso,
             config=session_config
         )
     except Exception as e:
-        logger.error(f"Error creating session: {str(e)}")
+        logger.error("Error creating session: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
 @app.get("/api/sessions/{session_id}", response_model=SessionStatusResponse)
 async def get_session_status(
     session_id: str,
-    session_mgr: SessionManager = Depends(get_session_manager),
+    session: SessionState = Depends(get_session_dep),
     proc_service: RAGProcessingService = Depends(get_processing_service)
 ):
     """Get session status"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     processing_status = proc_service.get_processing_status(session_id)
 
     return SessionStatusResponse(
@@ -219,8 +279,8 @@ async def get_session_status(
         status=session.status,
         current_step=session.current_step,
         progress_percentage=session.progress_percentage,
-        created_at=session.created_at.isoformat(),
-        last_activity=session.updated_at.isoformat(),
+        created_at=session.created_at_iso,
+        last_activity=session.updated_at_iso,
         processing_status=processing_status,
         has_user_input=session.user_input is not None,
         has_cp_atp_result=session.cp_atp_result is not None,
@@ -234,31 +294,14 @@ async def get_session_status(
 async def submit_user_input(
     session_id: str,
     user_input: UserInputRequest,
+    session: SessionState = Depends(get_session_dep),
     session_mgr: SessionManager = Depends(get_session_manager),
     proc_service: RAGProcessingService = Depends(get_processing_service)
 ):
     """Submit user input and start processing"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     try:
-        # Convert to core model
-        core_user_input = UserInput(
-            nama_guru=user_input.nama_guru,
-            nama_sekolah=user_input.nama_sekolah,
-            mata_pelajaran=user_input.mata_pelajaran,
-            topik=user_input.topik,
-            sub_topik=user_input.sub_topik,
-            kelas=user_input.kelas,
-            alokasi_waktu=user_input.alokasi_waktu,
-            model_llm=user_input.model_llm,
-            cp=user_input.cp,
-            atp=user_input.atp
-        )
-
-        # Set user input
-        session_mgr.set_user_input(session_id, core_user_input)
+        # Set user input (konversi ke core model dilakukan oleh session manager)
+        session_mgr.set_user_input(session_id, user_input)
 
         # Start processing
         processing_started = await proc_service.start_processing(session_id)
@@ -266,35 +309,31 @@ async def submit_user_input(
         if not processing_started:
             raise HTTPException(status_code=500, detail="Failed to start processing")
 
-        logger.info(f"User input submitted and processing started for session: {session_id}")
+        logger.info("User input submitted and processing started for session: %s", session_id)
 
         return {
             "message": "User input received and processing started",
             "session_id": session_id,
             "status": "processing_started",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
 
     except Exception as e:
-        logger.error(f"Error submitting user input: {str(e)}")
+        logger.error("Error submitting user input: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to process user input: {str(e)}")
 
 @app.post("/api/sessions/{session_id}/validate")
 async def submit_validation(
     session_id: str,
     validation: ValidationRequest,
-    session_mgr: SessionManager = Depends(get_session_manager),
+    session: SessionState = Depends(get_session_dep),
     proc_service: RAGProcessingService = Depends(get_processing_service)
 ):
     """Submit validation for CP/ATP"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     if session.status != SessionStatusEnum.USER_VALIDATION:
         raise HTTPException(
             status_code=400,
-            detail=f"Session not in validation state. Current status: {session.status.value}"
+            detail=f"Session not in validation state. Current status: {session.status_value}"
         )
 
     try:
@@ -304,111 +343,99 @@ async def submit_validation(
         if not validation_handled:
             raise HTTPException(status_code=500, detail="Failed to handle validation")
 
-        logger.info(f"Validation submitted for session: {session_id}, approved: {validation.is_approved}")
+        logger.info("Validation submitted for session: %s, approved: %s", session_id, validation.is_approved)
 
         return {
             "message": "Validation received and processed",
             "session_id": session_id,
             "validation_approved": validation.is_approved,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
 
     except Exception as e:
-        logger.error(f"Error submitting validation: {str(e)}")
+        logger.error("Error submitting validation: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to process validation: {str(e)}")
 
+# Field tuple untuk response preview/result; attrgetter dibangun sekali saat import
+# sehingga tiap section dibaca dengan satu call, lalu di-encode langsung oleh orjson
+_PREVIEW_KEYS = (
+    "generated_cp", "generated_atp", "generation_strategy",
+    "confidence_score", "sources_used", "generation_metadata"
+)
+_get_preview = attrgetter(
+    "cp_content", "atp_content", "generation_strategy",
+    "confidence_score", "sources_used", "generation_metadata"
+)
+_PREVIEW_USER_INPUT_KEYS = (
+    "nama_guru", "nama_sekolah", "mata_pelajaran", "topik",
+    "sub_topik", "kelas", "alokasi_waktu"
+)
+_get_preview_user_input = attrgetter(*_PREVIEW_USER_INPUT_KEYS)
+_RESULT_USER_INPUT_KEYS = _PREVIEW_USER_INPUT_KEYS + ("model_llm", "cp", "atp")
+_get_result_user_input = attrgetter(*_RESULT_USER_INPUT_KEYS)
+_VALIDATION_KEYS = ("is_approved", "feedback", "requested_changes")
+_get_validation = attrgetter(*_VALIDATION_KEYS)
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+def negotiate_response(request: Request, content: Dict[str, Any]) -> Response:
+    """Encode content sebagai MessagePack jika client meminta via Accept, selain itu JSON"""
+    if MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(content=_MSGPACK_ENCODER.encode(content), media_type=MSGPACK_MEDIA_TYPE)
+    return ORJSONResponse(content)
+
 @app.get("/api/sessions/{session_id}/preview")
 async def get_cp_atp_preview(
     session_id: str,
-    session_mgr: SessionManager = Depends(get_session_manager)
+    request: Request,
+    session: SessionState = Depends(get_session_dep)
 ):
     """Get CP/ATP preview for validation - shows current generated content"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     if not session.cp_atp_result:
         raise HTTPException(status_code=404, detail="CP/ATP result not yet available")
 
     # Return preview of generated CP/ATP
-    return {
+    return negotiate_response(request, {
         "session_id": session_id,
-        "status": session.status.value,
-        "preview": {
-            "generated_cp": session.cp_atp_result.cp_content,
-            "generated_atp": session.cp_atp_result.atp_content,
-            "generation_strategy": session.cp_atp_result.generation_strategy,
-            "confidence_score": session.cp_atp_result.confidence_score,
-            "sources_used": session.cp_atp_result.sources_used,
-            "generation_metadata": session.cp_atp_result.generation_metadata
-        },
-        "user_input": {
-            "nama_guru": session.user_input.nama_guru,
-            "nama_sekolah": session.user_input.nama_sekolah,
-            "mata_pelajaran": session.user_input.mata_pelajaran,
-            "topik": session.user_input.topik,
-            "sub_topik": session.user_input.sub_topik,
-            "kelas": session.user_input.kelas,
-            "alokasi_waktu": session.user_input.alokasi_waktu
-        },
+        "status": session.status_value,
+        "preview": dict(zip(_PREVIEW_KEYS, _get_preview(session.cp_atp_result))),
+        "user_input": dict(zip(_PREVIEW_USER_INPUT_KEYS, _get_preview_user_input(session.user_input))),
         "instructions": "Review the generated CP/ATP above. Use POST /api/sessions/{session_id}/validate to approve or request changes.",
-        "timestamp": datetime.now().isoformat()
-    }
+        "timestamp": _now_iso()
+    })
 
-@app.get("/api/sessions/{session_id}/result")
+@app.get("/api/sessions/{session_id}/result", response_model=FinalInputResponse)
 async def get_final_result(
     session_id: str,
-    session_mgr: SessionManager = Depends(get_session_manager)
+    request: Request,
+    session: SessionState = Depends(get_session_dep)
 ):
     """Get final result for session"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     if not session.final_input:
         raise HTTPException(status_code=404, detail="Final result not yet available")
 
     # Create response
-    final_response = FinalInputResponse(
-        session_id=session_id,
-        user_input=UserInputRequest(
-            nama_guru=session.final_input.user_input.nama_guru,
-            nama_sekolah=session.final_input.user_input.nama_sekolah,
-            mata_pelajaran=session.final_input.user_input.mata_pelajaran,
-            topik=session.final_input.user_input.topik,
-            sub_topik=session.final_input.user_input.sub_topik,
-            kelas=session.final_input.user_input.kelas,
-            alokasi_waktu=session.final_input.user_input.alokasi_waktu,
-            model_llm=session.final_input.user_input.model_llm,
-            cp=session.final_input.user_input.cp,
-            atp=session.final_input.user_input.atp
-        ),
-        cp_content=session.final_input.cp_content,
-        atp_content=session.final_input.atp_content,
-        processing_metadata=session.final_input.processing_metadata,
-        validation_history=[
-            {
-                "is_approved": v.is_approved,
-                "feedback": v.feedback,
-                "requested_changes": v.requested_changes
-            } for v in session.final_input.validation_history
+    final_input = session.final_input
+    return negotiate_response(request, {
+        "session_id": session_id,
+        "user_input": dict(zip(_RESULT_USER_INPUT_KEYS, _get_result_user_input(final_input.user_input))),
+        "cp_content": final_input.cp_content,
+        "atp_content": final_input.atp_content,
+        "processing_metadata": final_input.processing_metadata,
+        "validation_history": [
+            dict(zip(_VALIDATION_KEYS, _get_validation(v))) for v in final_input.validation_history
         ],
-        completed_at=datetime.now().isoformat()
-    )
-
-    return final_response
+        "completed_at": _now_iso()
+    })
 
 @app.delete("/api/sessions/{session_id}")
 async def delete_session(
     session_id: str,
+    session: SessionState = Depends(get_session_dep),
     session_mgr: SessionManager = Depends(get_session_manager),
     proc_service: RAGProcessingService = Depends(get_processing_service)
 ):
     """Delete session"""
-    session = session_mgr.get_session(session_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-
     try:
         # Cancel processing if running
         await proc_service.cancel_processing(session_id)
@@ -418,27 +445,23 @@ async def delete_session(
 
         # Close WebSocket connections
         if session_id in websocket_connections:
-            connections = websocket_connections[session_id].copy()
-            for websocket in connections:
-                try:
-                    await websocket.close()
-                except Exception:
-                    pass
-            del websocket_connections[session_id]
+            connections = websocket_connections.pop(session_id)
+            # Close paralel; satu close handshake yang lambat tidak menahan yang lain
+            await asyncio.gather(*(ws.close() for ws in connections), return_exceptions=True)
 
         if not removed:
             raise HTTPException(status_code=500, detail="Failed to remove session")
 
-        logger.info(f"Session deleted: {session_id}")
+        logger.info("Session deleted: %s", session_id)
 
         return {
             "message": "Session deleted successfully",
             "session_id": session_id,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
 
     except Exception as e:
-        logger.error(f"Error deleting session: {str(e)}")
+        logger.error("Error deleting session: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to delete session: {str(e)}")
 
 @app.get("/api/sessions")
@@ -454,9 +477,9 @@ async def list_sessions(
         "sessions": [
             {
                 "session_id": session.session_id,
-                "status": session.status.value,
-                "created_at": session.created_at.isoformat(),
-                "last_activity": session.updated_at.isoformat(),
+                "status": session.status_value,
+                "created_at": session.created_at_iso,
+                "last_activity": session.updated_at_iso,
                 "progress_percentage": session.progress_percentage,
                 "has_user_input": session.user_input is not None,
                 "has_final_input": session.final_input is not None
@@ -472,7 +495,9 @@ async def list_sessions(
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """WebSocket endpoint untuk real-time communication"""
-    await websocket.accept()
+    binary = MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", ())
+    await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL if binary else None)
+    websocket.state.msgpack = binary
 
     # Verify session exists
     if session_manager is None:
@@ -486,44 +511,46 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
 
     # Add connection
     add_websocket_connection(session_id, websocket)
-    logger.info(f"WebSocket connected for session: {session_id}")
+    logger.info("WebSocket connected for session: %s", session_id)
 
     try:
         # Send initial status
-        await websocket.send_text(json.dumps({
+        await send_ws_message(websocket, {
             "type": "connection_established",
             "session_id": session_id,
-            "status": session.status.value,
-            "timestamp": datetime.now().isoformat()
-        }))
+            "status": session.status_value,
+            "timestamp": datetime.now()
+        })
 
-        # Listen for messages
-        while True:
+        # Listen for messages; iterator berhenti dengan sendirinya saat client disconnect
+        decode = _MSGPACK_DECODER.decode if binary else orjson.loads
+        async for data in (websocket.iter_bytes() if binary else websocket.iter_text()):
             try:
-                data = await websocket.receive_text()
-                message_data = json.loads(data)
+                message_data = decode(data)
 
                 # Handle different message types
                 await handle_websocket_message(session_id, message_data, websocket)
 
-            except json.JSONDecodeError:
-                await websocket.send_text(json.dumps({
+            except (orjson.JSONDecodeError, msgspec.DecodeError):
+                await send_ws_message(websocket, {
                     "type": "error",
-                    "error_message": "Invalid JSON format",
-                    "timestamp": datetime.now().isoformat()
-                }))
+                    "error_message": "Invalid MessagePack format" if binary else "Invalid JSON format",
+                    "timestamp": datetime.now()
+                })
             except Exception as e:
-                logger.error(f"Error handling WebSocket message: {str(e)}")
-                await websocket.send_text(json.dumps({
+                logger.error("Error handling WebSocket message: %s", e)
+                await send_ws_message(websocket, {
                     "type": "error",
                     "error_message": f"Message handling error: {str(e)}",
-                    "timestamp": datetime.now().isoformat()
-                }))
+                    "timestamp": datetime.now()
+                })
+
+        logger.info("WebSocket disconnected for session: %s", session_id)
 
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected for session: {session_id}")
+        logger.info("WebSocket disconnected for session: %s", session_id)
     except Exception as e:
-        logger.error(f"WebSocket error for session {session_id}: {str(e)}")
+        logger.error("WebSocket error for session %s: %s", session_id, e)
     finally:
         # Remove connection
         remove_websocket_connection(session_id, websocket)
@@ -533,52 +560,52 @@ async def handle_websocket_message(session_id: str, message_data: Dict[str, Any]
     message_type = message_data.get("type")
 
     if message_type == "ping":
-        await websocket.send_text(json.dumps({
+        await send_ws_message(websocket, {
             "type": "pong",
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now()
+        })
 
     elif message_type == "get_status":
         if processing_service:
             status = processing_service.get_processing_status(session_id)
-            await websocket.send_text(json.dumps({
+            await send_ws_message(websocket, {
                 "type": "status_response",
                 "data": status,
-                "timestamp": datetime.now().isoformat()
-            }))
+                "timestamp": datetime.now()
+            })
 
     else:
-        await websocket.send_text(json.dumps({
+        await send_ws_message(websocket, {
             "type": "unknown_message_type",
             "received_type": message_type,
-            "timestamp": datetime.now().isoformat()
-        }))
+            "timestamp": datetime.now()
+        })
 
 # === Error Handlers ===
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
             "status_code": exc.status_code,
             "detail": exc.detail,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
     """Handle general exceptions"""
-    logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    logger.error("Unhandled exception: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": True,
             "status_code": 500,
             "detail": "Internal server error",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional, List, Dict, Any
 from enum import Enum
 from datetime import datetime
 
+import msgspec
+
 class LLMModel(Enum):
     GEMINI_1_5_FLASH = "gemini-1.5-flash"
     GEMINI_1_5_PRO = "gemini-1.5-pro"
@@ -30,9 +32,8 @@ class OrchestrationStrategy(Enum):
     ITERATIVE_REFINEMENT = "iterative_refinement"
     QUALITY_CHECK = "quality_check"
 
-@dataclass
-class UserInput:
-    """Data class for user input"""
+class UserInput(msgspec.Struct):
+    """Data class for user input (serialize via msgspec.to_builtins)"""
     nama_guru: str
     nama_sekolah: str
     mata_pelajaran: str
@@ -54,23 +55,7 @@ class UserInput:
         """Check if CP and ATP are provided"""
         return bool(self.cp and self.atp)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "nama_guru": self.nama_guru,
-            "nama_sekolah": self.nama_sekolah,
-            "mata_pelajaran": self.mata_pelajaran,
-            "topik": self.topik,
-            "sub_topik": self.sub_topik,
-            "kelas": self.kelas,
-            "fase": self.fase,
-            "alokasi_waktu": self.alokasi_waktu,
-            "model_llm": self.model_llm.value,
-            "cp": self.cp,
-            "atp": self.atp
-        }
-
-@dataclass
+@dataclass(slots=True)
 class CompleteInput:
     """Complete Input dengan semua field yang diperlukan"""
     nama_guru: str
@@ -89,26 +74,17 @@ class CompleteInput:
     processing_metadata: Dict[str, Any]
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "nama_guru": self.nama_guru,
-            "nama_sekolah": self.nama_sekolah,
-            "mata_pelajaran": self.mata_pelajaran,
-            "kelas": self.kelas,
-            "fase": self.fase,
-            "topik": self.topik,
-            "sub_topik": self.sub_topik,
-            "alokasi_waktu": self.alokasi_waktu,
-            "cp": self.cp,
-            "atp": self.atp,
-            "llm_model_choice": self.llm_model_choice,
-            "timestamp": self.timestamp,
-            "status": self.status.value,
-            "processing_metadata": self.processing_metadata
-        }
+        """Convert to dictionary (shallow, status sebagai value)"""
+        data = {name: getattr(self, name) for name in _COMPLETE_INPUT_FIELDS}
+        data["status"] = self.status.value
+        return data
 
     def to_json_standard(self) -> Dict[str, Any]:
-        """Convert to standard JSON format untuk output sistem"""
+        """Convert to standard JSON format untuk output sistem.
+
+        Return dict (bukan JSON string) agar caller cukup serialize sekali
+        bersama envelope-nya.
+        """
         return {
             "complete_input": {
                 "basic_info": {
@@ -134,7 +110,9 @@ class CompleteInput:
             }
         }
 
-@dataclass
+_COMPLETE_INPUT_FIELDS = tuple(field.name for field in fields(CompleteInput))
+
+@dataclass(slots=True)
 class TaskAnalysisResult:
     """Result of task analysis dengan scoring system"""
     complexity_level: str  # "simple", "medium", "complex"
@@ -152,7 +130,7 @@ class TaskAnalysisResult:
     # Additional metadata
     analysis_metadata: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class StrategySelectionResult:
     """Result dari strategy selection dengan scoring"""
     selected_strategy: RAGStrategy
@@ -161,7 +139,7 @@ class StrategySelectionResult:
     fallback_strategies: List[RAGStrategy]
     selection_reasoning: str
 
-@dataclass
+@dataclass(slots=True)
 class MonitoringResult:
     """Result dari monitoring process"""
     retrieval_confidence: float  # C_r
@@ -170,8 +148,7 @@ class MonitoringResult:
     quality_metrics: Dict[str, float]
     recommendations: List[str]
 
-@dataclass
-class CPATPResult:
+class CPATPResult(msgspec.Struct):
     """Result of CP/ATP generation"""
     cp_content: str
     atp_content: str
@@ -179,18 +156,7 @@ class CPATPResult:
     confidence_score: float
     sources_used: List[str]
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "cp_content": self.cp_content,
-            "atp_content": self.atp_content,
-            "generation_strategy": self.generation_strategy.value,
-            "confidence_score": self.confidence_score,
-            "sources_used": self.sources_used
-        }
-
-@dataclass
-class ValidationResult:
+class ValidationResult(msgspec.Struct):
     """Result of validation process"""
     is_valid: bool
     is_approved: bool = True  # For user approval
@@ -212,27 +178,10 @@ class ValidationResult:
         """Check if validation has warnings"""
         return bool(self.warnings)
 
-@dataclass
-class FinalInput:
+class FinalInput(msgspec.Struct):
     """Final processed input ready for module generation"""
     user_input: UserInput
     cp_content: str
     atp_content: str
     processing_metadata: Dict[str, Any]
     validation_history: List[ValidationResult]
-
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "user_input": self.user_input.to_dict(),
-            "cp_content": self.cp_content,
-            "atp_content": self.atp_content,
-            "processing_metadata": self.processing_metadata,
-            "validation_history": [
-                {
-                    "is_approved": v.is_approved,
-                    "feedback": v.feedback,
-                    "requested_changes": v.requested_changes
-                } for v in self.validation_history
-            ]
-        }
@@ -11,7 +11,9 @@ Updated: Sesuai dengan instruksi Orchestrated RAG terbaru
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List, Union
+import hashlib
+from operator import attrgetter
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 from datetime import datetime
 from enum import Enum
 
@@ -23,9 +25,56 @@ from ..utils.logger import get_logger
 from ..services.llm_service import LLMService
 from ..services.vector_db_service import VectorDBService
 from ..services.online_search_service import OnlineSearchService
+from ..services.response_cache import ResponseCache
 
 logger = get_logger("PromptBuilderAgent")
 
+# Instruksi statis CP/ATP dikirim sebagai system prompt; dokumen referensi dan
+# field dari user ada di user prompt (lihat _generate_cp/_generate_atp)
+CP_SYSTEM_PROMPT = """Sebagai ahli kurikulum, buatlah Capaian Pembelajaran (CP) untuk mata pelajaran, kelas, fase, topik, dan sub topik yang diberikan.
+
+Buatlah CP yang:
+1. Sesuai dengan kurikulum merdeka
+2. Menggunakan kata kerja operasional yang tepat
+3. Mencakup domain kognitif, afektif, dan psikomotorik
+4. Spesifik untuk topik yang diminta
+5. Sesuai dengan tingkat perkembangan siswa"""
+
+ATP_SYSTEM_PROMPT = """Sebagai ahli kurikulum, buatlah Alur Tujuan Pembelajaran (ATP) dari Capaian Pembelajaran (CP) dan data pembelajaran yang diberikan.
+
+Buatlah ATP yang:
+1. Menguraikan CP menjadi tujuan pembelajaran yang terstruktur
+2. Mengurutkan dari yang sederhana ke kompleks
+3. Dapat dicapai dalam alokasi waktu yang tersedia
+4. Menggunakan kata kerja operasional yang measurable
+5. Sesuai dengan karakteristik siswa pada kelas yang diberikan"""
+
+# Interval penggabungan chunk stream LLM sebelum diteruskan ke callback (detik);
+# provider bisa mengirim puluhan chunk kecil per detik
+STREAM_FLUSH_INTERVAL = 0.075
+
+REQUIRED_FIELDS = (
+    'nama_guru', 'nama_sekolah', 'mata_pelajaran',
+    'kelas', 'fase', 'topik', 'sub_topik', 'alokasi_waktu'
+)
+_get_required_values = attrgetter(*REQUIRED_FIELDS)
+
+def _has_text(value: Optional[str]) -> bool:
+    """True jika string berisi karakter non-whitespace.
+
+    isspace() berhenti di karakter non-whitespace pertama dan tidak membuat
+    salinan string, berbeda dengan len(value.strip()) yang men-scan dan
+    meng-copy seluruh CP/ATP.
+    """
+    return bool(value) and not value.isspace()
+
+def _missing_required_fields(user_input: UserInput) -> List[str]:
+    """Field wajib yang kosong atau hanya berisi whitespace"""
+    return [
+        field for field, value in zip(REQUIRED_FIELDS, _get_required_values(user_input))
+        if not value or (isinstance(value, str) and value.isspace())
+    ]
+
 class InputCompleteness(Enum):
     """Status kelengkapan input"""
     COMPLETE = "complete"
@@ -48,12 +97,10 @@ class PromptBuilderAgent:
         self.llm_service = llm_service
         self.vector_db_service = vector_db_service
         self.online_search_service = OnlineSearchService()
+        self.response_cache = ResponseCache(llm_service)
 
         # Required fields untuk Complete Input
-        self.required_fields = [
-            'nama_guru', 'nama_sekolah', 'mata_pelajaran',
-            'kelas', 'fase', 'topik', 'sub_topik', 'alokasi_waktu'
-        ]
+        self.required_fields = list(REQUIRED_FIELDS)
 
         # Optional fields yang akan digenerate jika tidak ada
         self.optional_fields = ['cp', 'atp']
@@ -64,7 +111,8 @@ class PromptBuilderAgent:
         self,
         user_input: UserInput,
         llm_model_choice: str = "gemini",
-        callback_func: Optional[callable] = None
+        callback_func: Optional[callable] = None,
+        use_cache: bool = True
     ) -> CompleteInput:
         """
         Main function untuk membangun Complete Input
@@ -73,6 +121,7 @@ class PromptBuilderAgent:
             user_input: Input awal dari user
             llm_model_choice: Model LLM yang dipilih (gemini/openai)
             callback_func: Callback untuk komunikasi real-time dengan user
+            use_cache: False untuk melewati lookup response cache (regenerate)
 
         Returns:
             CompleteInput: Input yang sudah lengkap dan siap diproses
@@ -107,7 +156,7 @@ class PromptBuilderAgent:
                 })
 
                 cp_content, atp_content = await self._generate_cp_atp(
-                    user_input, llm_model_choice, callback_func
+                    user_input, llm_model_choice, callback_func, use_cache
                 )
 
             # Step 4: Create Complete Input
@@ -141,7 +190,7 @@ class PromptBuilderAgent:
 
             await self._notify_callback(callback_func, "complete_input_ready", {
                 "message": "Complete Input successfully created",
-                "complete_input": complete_input.to_dict()
+                "complete_input": complete_input
             })
 
             logger.success("Complete Input building process completed")
@@ -173,8 +222,8 @@ class PromptBuilderAgent:
             return InputCompleteness.MISSING_BASIC_INFO
 
         # Check CP/ATP availability
-        has_cp = user_input.cp and len(user_input.cp.strip()) > 0
-        has_atp = user_input.atp and len(user_input.atp.strip()) > 0
+        has_cp = _has_text(user_input.cp)
+        has_atp = _has_text(user_input.atp)
 
         if not has_cp and not has_atp:
             logger.info("CP and ATP not provided, generation required")
@@ -196,21 +245,14 @@ class PromptBuilderAgent:
         Returns:
             List[str]: Daftar field yang hilang
         """
-        missing = []
-        input_dict = user_input.to_dict()
-
-        for field in self.required_fields:
-            value = input_dict.get(field)
-            if not value or (isinstance(value, str) and len(value.strip()) == 0):
-                missing.append(field)
-
-        return missing
+        return _missing_required_fields(user_input)
 
     async def _generate_cp_atp(
         self,
         user_input: UserInput,
         llm_model_choice: str,
-        callback_func: Optional[callable] = None
+        callback_func: Optional[callable] = None,
+        use_cache: bool = True
     ) -> tuple[str, str]:
         """
         Generate CP dan ATP menggunakan RAG dan LLM
@@ -219,45 +261,56 @@ class PromptBuilderAgent:
             user_input: Input dari user
             llm_model_choice: Model LLM yang dipilih
             callback_func: Callback untuk update real-time
+            use_cache: False untuk melewati lookup response cache
 
         Returns:
             tuple[str, str]: CP content dan ATP content
         """
         logger.info("Starting CP/ATP generation")
 
+        atp_documents_task = None
         try:
             # Step 1: Search relevant documents
             await self._notify_callback(callback_func, "searching_documents", {
                 "message": "Searching for relevant CP/ATP documents..."
             })
 
-            cp_documents = await self._search_relevant_documents(
-                user_input, "cp", callback_func
+            # Satu batch search vector DB untuk CP dan ATP (query sama, embedding sekali)
+            search_query = self._build_search_query(user_input)
+            vector_results = await self.vector_db_service.search_documents_batch(
+                [(search_query, "cp"), (search_query, "atp")], top_k=5
+            )
+
+            # Fallback online ATP berjalan di background selama generate CP,
+            # karena hanya prompt ATP yang bergantung pada hasil CP
+            atp_documents_task = asyncio.create_task(
+                self._supplement_with_online(user_input, "atp", vector_results["atp"], callback_func)
             )
-            atp_documents = await self._search_relevant_documents(
-                user_input, "atp", callback_func
+            cp_documents = await self._supplement_with_online(
+                user_input, "cp", vector_results["cp"], callback_func
             )
 
             # Step 2: Generate CP
             cp_content = ""
-            if not user_input.cp or len(user_input.cp.strip()) == 0:
+            if not _has_text(user_input.cp):
                 await self._notify_callback(callback_func, "generating_cp", {
                     "message": "Generating CP content..."
                 })
                 cp_content = await self._generate_cp(
-                    user_input, cp_documents, llm_model_choice
+                    user_input, cp_documents, llm_model_choice, callback_func, use_cache
                 )
             else:
                 cp_content = user_input.cp
 
             # Step 3: Generate ATP
+            atp_documents = await atp_documents_task
             atp_content = ""
-            if not user_input.atp or len(user_input.atp.strip()) == 0:
+            if not _has_text(user_input.atp):
                 await self._notify_callback(callback_func, "generating_atp", {
                     "message": "Generating ATP content..."
                 })
                 atp_content = await self._generate_atp(
-                    user_input, atp_documents, llm_model_choice, cp_content
+                    user_input, atp_documents, llm_model_choice, cp_content, callback_func, use_cache
                 )
             else:
                 atp_content = user_input.atp
@@ -268,34 +321,35 @@ class PromptBuilderAgent:
         except Exception as e:
             logger.error(f"Error generating CP/ATP: {str(e)}")
             raise
+        finally:
+            # Jangan biarkan search online ATP berjalan jika CP gagal
+            if atp_documents_task is not None and not atp_documents_task.done():
+                atp_documents_task.cancel()
+
+    @staticmethod
+    def _build_search_query(user_input: UserInput) -> str:
+        """Query vector DB untuk dokumen CP/ATP"""
+        return f"{user_input.mata_pelajaran} {user_input.kelas} {user_input.fase} {user_input.topik}"
 
-    async def _search_relevant_documents(
+    async def _supplement_with_online(
         self,
         user_input: UserInput,
         doc_type: str,
+        vector_results: List[Dict[str, Any]],
         callback_func: Optional[callable] = None
     ) -> List[Dict[str, Any]]:
         """
-        Search dokumen yang relevan dari vector DB dan online jika perlu
+        Tambahkan hasil online search jika hasil vector DB kurang dari 3
 
         Args:
             user_input: Input dari user
             doc_type: Type dokumen ("cp" atau "atp")
+            vector_results: Hasil search vector DB
             callback_func: Callback untuk update
 
         Returns:
             List[Dict]: Dokumen yang relevan
         """
-        # Create search query
-        search_query = f"{user_input.mata_pelajaran} {user_input.kelas} {user_input.fase} {user_input.topik}"
-
-        # Search in vector DB first
-        vector_results = await self.vector_db_service.search_documents(
-            query=search_query,
-            doc_type=doc_type,
-            top_k=5
-        )
-
         # If insufficient results, search online
         if len(vector_results) < 3:
             await self._notify_callback(callback_func, "searching_online", {
@@ -314,7 +368,9 @@ class PromptBuilderAgent:
         self,
         user_input: UserInput,
         documents: List[Dict[str, Any]],
-        llm_model: str
+        llm_model: str,
+        callback_func: Optional[callable] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Generate Capaian Pembelajaran (CP) menggunakan LLM
@@ -323,15 +379,14 @@ class PromptBuilderAgent:
             user_input: Input dari user
             documents: Dokumen referensi
             llm_model: Model LLM yang digunakan
+            callback_func: Callback untuk streaming chunk ("cp_chunk")
+            use_cache: False untuk melewati lookup response cache
 
         Returns:
             str: CP content yang dihasilkan
         """
-        # Build context from documents
-        context = "\n".join([doc.get("content", "") for doc in documents[:3]])
-
-        prompt = f"""
-Sebagai ahli kurikulum, buatlah Capaian Pembelajaran (CP) untuk:
+        prompt = f"""Referensi dokumen:
+{self._build_context(documents)}
 
 Mata Pelajaran: {user_input.mata_pelajaran}
 Kelas: {user_input.kelas}
@@ -339,33 +394,21 @@ Fase: {user_input.fase}
 Topik: {user_input.topik}
 Sub Topik: {user_input.sub_topik}
 
-Referensi dokumen:
-{context}
+CP:"""
 
-Buatlah CP yang:
-1. Sesuai dengan kurikulum merdeka
-2. Menggunakan kata kerja operasional yang tepat
-3. Mencakup domain kognitif, afektif, dan psikomotorik
-4. Spesifik untuk topik yang diminta
-5. Sesuai dengan tingkat perkembangan siswa
-
-CP:
-"""
-
-        response = await self.llm_service.generate_text(
-            prompt=prompt,
-            model=llm_model,
-            max_tokens=1000
+        return await self._generate_cached(
+            "cp", user_input, CP_SYSTEM_PROMPT, prompt, llm_model, 1000,
+            callback_func, use_cache=use_cache
         )
 
-        return response.strip()
-
     async def _generate_atp(
         self,
         user_input: UserInput,
         documents: List[Dict[str, Any]],
         llm_model: str,
-        cp_content: str
+        cp_content: str,
+        callback_func: Optional[callable] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Generate Alur Tujuan Pembelajaran (ATP) menggunakan LLM
@@ -375,15 +418,17 @@ CP:
             documents: Dokumen referensi
             llm_model: Model LLM yang digunakan
             cp_content: CP yang sudah dihasilkan
+            callback_func: Callback untuk streaming chunk ("atp_chunk")
+            use_cache: False untuk melewati lookup response cache
 
         Returns:
             str: ATP content yang dihasilkan
         """
-        # Build context from documents
-        context = "\n".join([doc.get("content", "") for doc in documents[:3]])
+        prompt = f"""Referensi dokumen:
+{self._build_context(documents)}
 
-        prompt = f"""
-Sebagai ahli kurikulum, buatlah Alur Tujuan Pembelajaran (ATP) untuk:
+Capaian Pembelajaran (CP):
+{cp_content.strip()}
 
 Mata Pelajaran: {user_input.mata_pelajaran}
 Kelas: {user_input.kelas}
@@ -392,29 +437,135 @@ Topik: {user_input.topik}
 Sub Topik: {user_input.sub_topik}
 Alokasi Waktu: {user_input.alokasi_waktu}
 
-Capaian Pembelajaran (CP):
-{cp_content}
+ATP:"""
 
-Referensi dokumen:
-{context}
+        # ATP bergantung pada CP dan alokasi waktu, jadi keduanya masuk scope
+        # semantic cache; ATP untuk CP lain tidak pernah dipakai ulang
+        cp_hash = hashlib.sha256(cp_content.encode()).hexdigest()[:16]
+        return await self._generate_cached(
+            "atp", user_input, ATP_SYSTEM_PROMPT, prompt, llm_model, 1500,
+            callback_func, scope_extra=f"{user_input.alokasi_waktu}|{cp_hash}", use_cache=use_cache
+        )
 
-Buatlah ATP yang:
-1. Menguraikan CP menjadi tujuan pembelajaran yang terstruktur
-2. Mengurutkan dari yang sederhana ke kompleks
-3. Dapat dicapai dalam alokasi waktu yang tersedia
-4. Menggunakan kata kerja operasional yang measurable
-5. Sesuai dengan karakteristik siswa kelas {user_input.kelas}
+    async def _generate_cached(
+        self,
+        doc_type: str,
+        user_input: UserInput,
+        system_prompt: str,
+        prompt: str,
+        llm_model: str,
+        max_tokens: int,
+        callback_func: Optional[callable] = None,
+        scope_extra: str = "",
+        use_cache: bool = True
+    ) -> str:
+        """
+        Generate text lewat response cache; LLM hanya dipanggil saat cache miss
+        dan response di-stream ke callback sebagai event "<doc_type>_chunk"
 
-ATP:
-"""
+        Args:
+            doc_type: Type dokumen ("cp" atau "atp")
+            user_input: Input dari user
+            system_prompt: Instruksi statis (prefix yang di-cache provider)
+            prompt: Prompt referensi + field dinamis
+            llm_model: Model LLM yang digunakan
+            max_tokens: Maximum tokens to generate
+            callback_func: Callback untuk streaming chunk
+            scope_extra: Komponen tambahan scope semantic cache
+            use_cache: False untuk selalu memanggil LLM; hasil baru tetap
+                disimpan dan menggantikan entry lama
 
-        response = await self.llm_service.generate_text(
-            prompt=prompt,
-            model=llm_model,
-            max_tokens=1500
+        Returns:
+            str: Content yang dihasilkan
+        """
+        scope = f"{doc_type}|{llm_model}|{user_input.mata_pelajaran}|{user_input.kelas}|{user_input.fase}|{scope_extra}"
+        topic = f"{user_input.topik} | {user_input.sub_topik}"
+
+        # Model ikut di key exact-match (dibagi antar worker via Redis), sama seperti scope
+        cache_key = f"{llm_model}\n{system_prompt}\n{prompt}"
+
+        if use_cache:
+            cached = await self.response_cache.get(cache_key, scope, topic)
+            if cached is not None:
+                logger.info(f"{doc_type.upper()} served from response cache")
+                return cached
+
+        response = await self._stream_to_callback(
+            self.llm_service.generate_text_stream(
+                prompt=prompt,
+                model=llm_model,
+                max_tokens=max_tokens,
+                system_prompt=system_prompt
+            ),
+            callback_func,
+            f"{doc_type}_chunk"
         )
 
-        return response.strip()
+        await self.response_cache.set(cache_key, scope, topic, response)
+        return response
+
+    async def _stream_to_callback(
+        self,
+        stream: AsyncIterator[str],
+        callback_func: Optional[callable],
+        event_type: str
+    ) -> str:
+        """
+        Kumpulkan chunk dari stream LLM sambil meneruskannya ke callback
+
+        Chunk diteruskan lewat asyncio.Queue oleh task terpisah, sehingga
+        callback yang lambat tidak menahan pembacaan stream dari provider.
+        Chunk yang masuk dalam STREAM_FLUSH_INTERVAL digabung menjadi satu
+        event {"delta": ...}.
+
+        Returns:
+            str: Seluruh text hasil stream (di-strip)
+        """
+        chunks: List[str] = []
+        if not callback_func:
+            async for chunk in stream:
+                chunks.append(chunk)
+            return "".join(chunks).strip()
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def forward():
+            finished = False
+            while not finished:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                parts = [chunk]
+                await asyncio.sleep(STREAM_FLUSH_INTERVAL)
+                while not queue.empty():
+                    chunk = queue.get_nowait()
+                    if chunk is None:
+                        finished = True
+                        break
+                    parts.append(chunk)
+                await self._notify_callback(callback_func, event_type, {"delta": "".join(parts)})
+
+        forwarder = asyncio.create_task(forward())
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                queue.put_nowait(chunk)
+        finally:
+            queue.put_nowait(None)
+            await forwarder
+
+        return "".join(chunks).strip()
+
+    async def aclose(self):
+        """Release resources milik agent (koneksi Redis response cache)"""
+        await self.response_cache.aclose()
+
+    @staticmethod
+    def _build_context(documents: List[Dict[str, Any]]) -> str:
+        """Gabungkan 3 dokumen referensi teratas; isi dokumen (baris, list) tidak diubah"""
+        return "\n\n".join(
+            content for doc in documents[:3] if (content := doc.get("content", "").strip())
+        )
 
     async def _notify_callback(
         self,
@@ -428,7 +579,8 @@ ATP:
         Args:
             callback_func: Callback function
             event_type: Jenis event
-            data: Data yang dikirim
+            data: Data yang dikirim; boleh berisi dataclass/Enum, serialize
+                dilakukan oleh transport (orjson/msgspec) bukan di sini
         """
         if callback_func:
             try:
@@ -458,10 +610,10 @@ ATP:
         if not complete_input.mata_pelajaran:
             errors.append("Mata pelajaran tidak boleh kosong")
 
-        if not complete_input.cp or len(complete_input.cp.strip()) == 0:
+        if not _has_text(complete_input.cp):
             errors.append("CP tidak boleh kosong")
 
-        if not complete_input.atp or len(complete_input.atp.strip()) == 0:
+        if not _has_text(complete_input.atp):
             errors.append("ATP tidak boleh kosong")
 
         # Check content quality
@@ -1,4 +1,5 @@
 import sys
+from datetime import datetime
 from typing import Optional, Tuple
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
@@ -286,6 +287,8 @@ dengan multiple strategy untuk menghasilkan modul pembelajaran berkualitas tingg
         # Processing metadata
         metadata_text = ""
         for key, value in final_input.processing_metadata.items():
+            if key == "timestamp_ns":
+                key, value = "timestamp", datetime.fromtimestamp(value / 1e9).isoformat(sep=" ", timespec="seconds")
             metadata_text += f"• {key}: {value}\n"
 
         metadata_panel = Panel(
@@ -25,6 +25,7 @@ from ..services.llm_service import LLMService, get_llm_service
 from ..services.vector_db_service import VectorDBService, get_vector_db_service
 from ..services.online_search_service import OnlineSearchService, get_online_search_service
 from ..utils.logger import get_logger
+from config.config import get_config
 
 logger = get_logger("EnhancedMainOrchestrator")
 
@@ -52,20 +53,10 @@ class EnhancedMainOrchestrator:
             self.vector_db_service
         )
 
-        # Threshold values berdasarkan instruksi (hasil pilot test)
-        self.thresholds = {
-            "simple_rag": 0.85,      # S_tmpl >= 0.85
-            "advanced_rag": 0.6,     # S_adv >= 0.6
-            "graph_rag": 0.5,        # S_graph >= 0.5
-            "overall_confidence": 0.8  # C_overall >= 0.8
-        }
-
-        # Weights untuk scoring calculations
-        self.weights = {
-            "template_matching": {"lambda_1": 0.8, "lambda_2": 0.2},
-            "advanced_rag": {"alpha_1": 0.3, "alpha_2": 0.25, "alpha_3": 0.25, "alpha_4": 0.2},
-            "graph_rag": {"beta_1": 0.4, "beta_2": 0.4, "beta_3": 0.2}
-        }
+        # Threshold dan weights dari config (env atau default hasil pilot test)
+        config = get_config()
+        self.thresholds = config.orchestrator_thresholds
+        self.weights = config.orchestrator_weights
 
         logger.info("Enhanced Main Orchestrator initialized with scoring system")
 
@@ -95,7 +86,7 @@ class EnhancedMainOrchestrator:
             task_analysis = await self._analyze_task(user_input)
 
             await self._notify_callback(callback_func, "task_analysis_complete", {
-                "analysis": task_analysis.__dict__,
+                "analysis": task_analysis,
                 "message": f"Task analysis completed - Complexity: {task_analysis.complexity_level}"
             })
 
@@ -107,7 +98,7 @@ class EnhancedMainOrchestrator:
             strategy_selection = await self._select_strategy(user_input, task_analysis)
 
             await self._notify_callback(callback_func, "strategy_selection_complete", {
-                "strategy": strategy_selection.__dict__,
+                "strategy": strategy_selection,
                 "message": f"Strategy selected: {strategy_selection.selected_strategy.value}"
             })
 
@@ -132,12 +123,12 @@ class EnhancedMainOrchestrator:
             )
 
             await self._notify_callback(callback_func, "quality_monitoring", {
-                "monitoring": monitoring_result.__dict__,
+                "monitoring": monitoring_result,
                 "message": f"Quality check completed - Overall confidence: {monitoring_result.overall_confidence:.2f}"
             })
 
             # Step 6: Re-routing if necessary
-            if monitoring_result.overall_confidence < self.thresholds["overall_confidence"]:
+            if monitoring_result.overall_confidence < self.thresholds.overall_confidence:
                 logger.warning("Quality check failed, attempting re-routing to Adaptive RAG")
 
                 await self._notify_callback(callback_func, "re_routing", {
@@ -159,6 +150,40 @@ class EnhancedMainOrchestrator:
             })
             raise
 
+    async def regenerate_cp_atp(
+        self,
+        user_input: UserInput,
+        callback_func: Optional[callable] = None
+    ) -> CompleteInput:
+        """
+        Generate ulang CP/ATP tanpa mengulang task analysis dan strategy selection
+
+        Args:
+            user_input: Input awal dari user
+            callback_func: Callback untuk real-time updates
+
+        Returns:
+            CompleteInput: Input dengan CP/ATP hasil generate ulang
+        """
+        logger.info("Regenerating CP/ATP")
+
+        try:
+            return await self.prompt_builder.build_complete_input(
+                user_input=user_input,
+                llm_model_choice=user_input.model_llm.value,
+                callback_func=callback_func,
+                # Regenerate harus menghasilkan content baru, bukan hit cache
+                use_cache=False
+            )
+
+        except Exception as e:
+            logger.error(f"Error in CP/ATP regeneration: {str(e)}")
+            await self._notify_callback(callback_func, "error", {
+                "error": str(e),
+                "message": "CP/ATP regeneration failed"
+            })
+            raise
+
     async def _analyze_task(self, user_input: UserInput) -> TaskAnalysisResult:
         """
         Comprehensive task analysis dengan scoring system
@@ -273,8 +298,8 @@ class EnhancedMainOrchestrator:
                 delta_hat = 0.0
 
             # Apply weights: λ₁ = 0.8, λ₂ = 0.2
-            lambda_1 = self.weights["template_matching"]["lambda_1"]
-            lambda_2 = self.weights["template_matching"]["lambda_2"]
+            lambda_1 = self.weights.template_matching.lambda_1
+            lambda_2 = self.weights.template_matching.lambda_2
 
             s_tmpl = (lambda_1 * mu_k) + (lambda_2 * delta_hat)
 
@@ -319,12 +344,12 @@ class EnhancedMainOrchestrator:
             s_prime = self._calculate_query_specificity(user_input)
 
             # Apply weights
-            weights = self.weights["advanced_rag"]
+            weights = self.weights.advanced_rag
             s_adv = (
-                weights["alpha_1"] * l_prime +
-                weights["alpha_2"] * e_prime +
-                weights["alpha_3"] * d_score +
-                weights["alpha_4"] * s_prime
+                weights.alpha_1 * l_prime +
+                weights.alpha_2 * e_prime +
+                weights.alpha_3 * d_score +
+                weights.alpha_4 * s_prime
             )
 
             logger.debug(f"Advanced RAG score: {s_adv:.3f} (L'={l_prime:.3f}, E'={e_prime:.3f}, D={d_score:.3f}, S'={s_prime:.3f})")
@@ -358,11 +383,11 @@ class EnhancedMainOrchestrator:
             i_pattern = 1.0 if any(keyword in query_text.lower() for keyword in relational_keywords) else 0.0
 
             # Apply weights
-            weights = self.weights["graph_rag"]
+            weights = self.weights.graph_rag
             s_graph = (
-                weights["beta_1"] * rho_prime +
-                weights["beta_2"] * delta_prime +
-                weights["beta_3"] * i_pattern
+                weights.beta_1 * rho_prime +
+                weights.beta_2 * delta_prime +
+                weights.beta_3 * i_pattern
             )
 
             logger.debug(f"Graph RAG score: {s_graph:.3f} (ρ'={rho_prime:.3f}, δ'={delta_prime:.3f}, I={i_pattern:.1f})")
@@ -390,11 +415,11 @@ class EnhancedMainOrchestrator:
             RAGStrategy: Strategy yang direkomendasikan
         """
         # Apply thresholds sesuai instruksi
-        if template_score >= self.thresholds["simple_rag"]:
+        if template_score >= self.thresholds.simple_rag:
             return RAGStrategy.SIMPLE
-        elif graph_score >= self.thresholds["graph_rag"]:
+        elif graph_score >= self.thresholds.graph_rag:
             return RAGStrategy.GRAPH
-        elif advanced_score >= self.thresholds["advanced_rag"]:
+        elif advanced_score >= self.thresholds.advanced_rag:
             return RAGStrategy.ADVANCED
         else:
             return RAGStrategy.ADAPTIVE
@@ -828,6 +853,17 @@ class EnhancedMainOrchestrator:
             }
         )
 
+    async def aclose(self):
+        """Release pooled clients milik prompt builder dan LLM service"""
+        results = await asyncio.gather(
+            self.prompt_builder.aclose(),
+            self.llm_service.aclose(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close orchestrator resource: {str(result)}")
+
     async def _notify_callback(
         self,
         callback_func: Optional[callable],
@@ -43,6 +43,7 @@ class UserInputRequest(BaseModel):
     topik: str = Field(..., description="Topik pembelajaran")
     sub_topik: str = Field(..., description="Sub topik pembelajaran")
     kelas: str = Field(..., description="Kelas (contoh: 'Kelas 5')")
+    fase: str = Field("", description="Fase kurikulum (contoh: 'C')")
     alokasi_waktu: str = Field(..., description="Alokasi waktu (contoh: '2 x 45 menit')")
     model_llm: LLMModelEnum = Field(..., description="Model LLM yang digunakan")
     cp: Optional[str] = Field(None, description="Capaian Pembelajaran (optional)")
@@ -11,7 +11,7 @@ Updated: Sesuai dengan instruksi Orchestrated RAG terbaru
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, AsyncIterator
 from abc import ABC, abstractmethod
 import google.generativeai as genai
 import openai
@@ -19,12 +19,7 @@ from openai import AsyncOpenAI
 
 from ..core.models import LLMModel
 from ..utils.logger import get_logger
-
-# Import config from root directory
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import Config
+from config.config import get_config
 
 logger = get_logger("LLMService")
 
@@ -37,16 +32,35 @@ class BaseLLMProvider(ABC):
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
-        """Generate text dari prompt"""
+        """Generate text dari prompt (system_prompt = prefix statis yang bisa di-cache provider)"""
         pass
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream text per chunk (default: satu chunk dari generate_text)"""
+        yield await self.generate_text(
+            prompt, max_tokens=max_tokens, temperature=temperature,
+            system_prompt=system_prompt, **kwargs
+        )
+
     @abstractmethod
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding dari text"""
         pass
 
+    async def aclose(self):
+        """Release client resources (default: tidak ada)"""
+        pass
+
 class GeminiProvider(BaseLLMProvider):
     """Provider untuk Google Gemini"""
 
@@ -65,11 +79,12 @@ class GeminiProvider(BaseLLMProvider):
         model: str = "gemini-1.5-flash",
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """Generate text menggunakan Gemini"""
         try:
-            model_instance = genai.GenerativeModel(model)
+            model_instance = genai.GenerativeModel(model, system_instruction=system_prompt)
 
             generation_config = genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -88,6 +103,37 @@ class GeminiProvider(BaseLLMProvider):
             logger.error(f"Error generating text with Gemini: {str(e)}")
             raise
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        model: str = "gemini-1.5-flash",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream text menggunakan Gemini"""
+        try:
+            model_instance = genai.GenerativeModel(model, system_instruction=system_prompt)
+
+            generation_config = genai.types.GenerationConfig(
+                max_output_tokens=max_tokens,
+                temperature=temperature
+            )
+
+            response = await model_instance.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error(f"Error streaming text with Gemini: {str(e)}")
+            raise
+
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding menggunakan Gemini"""
         try:
@@ -120,15 +166,20 @@ class OpenAIProvider(BaseLLMProvider):
         model: str = "gpt-4",
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """Generate text menggunakan OpenAI"""
         try:
+            # System message statis di depan agar prefix prompt sama byte-per-byte
+            # antar request dan kena automatic prompt caching
+            messages = [{"role": "user", "content": prompt}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+
             response = await self.client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
@@ -139,6 +190,36 @@ class OpenAIProvider(BaseLLMProvider):
             logger.error(f"Error generating text with OpenAI: {str(e)}")
             raise
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        model: str = "gpt-4",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream text menggunakan OpenAI"""
+        try:
+            messages = [{"role": "user", "content": prompt}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+
+            stream = await self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error(f"Error streaming text with OpenAI: {str(e)}")
+            raise
+
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding menggunakan OpenAI"""
         try:
@@ -153,6 +234,10 @@ class OpenAIProvider(BaseLLMProvider):
             logger.error(f"Error generating embedding with OpenAI: {str(e)}")
             raise
 
+    async def aclose(self):
+        """Close underlying HTTP client"""
+        await self.client.close()
+
 class LLMService:
     """
     Main LLM Service yang mengatur semua providers
@@ -165,18 +250,20 @@ class LLMService:
 
     def _initialize_providers(self):
         """Initialize semua available providers"""
+        config = get_config()
+
         # Initialize Gemini if API key available
-        if Config.GEMINI_API_KEY:
+        if config.gemini_api_key:
             try:
-                self.providers["gemini"] = GeminiProvider(Config.GEMINI_API_KEY)
+                self.providers["gemini"] = GeminiProvider(config.gemini_api_key)
                 logger.success("Gemini provider initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize Gemini provider: {str(e)}")
 
         # Initialize OpenAI if API key available
-        if Config.OPENAI_API_KEY:
+        if config.openai_api_key:
             try:
-                self.providers["openai"] = OpenAIProvider(Config.OPENAI_API_KEY)
+                self.providers["openai"] = OpenAIProvider(config.openai_api_key)
                 logger.success("OpenAI provider initialized successfully")
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI provider: {str(e)}")
@@ -191,6 +278,7 @@ class LLMService:
         model: str = "gemini",
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
         **kwargs
     ) -> str:
         """
@@ -201,6 +289,7 @@ class LLMService:
             model: Model choice ("gemini", "openai", atau specific model)
             max_tokens: Maximum tokens to generate
             temperature: Generation temperature
+            system_prompt: Instruksi statis yang dikirim sebagai system message
 
         Returns:
             str: Generated text
@@ -220,6 +309,7 @@ class LLMService:
                 model=model_name,
                 max_tokens=max_tokens,
                 temperature=temperature,
+                system_prompt=system_prompt,
                 **kwargs
             )
 
@@ -230,6 +320,43 @@ class LLMService:
             logger.error(f"Error generating text: {str(e)}")
             raise
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        model: str = "gemini",
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream text per chunk menggunakan model yang dipilih
+
+        Args:
+            prompt: Text prompt
+            model: Model choice ("gemini", "openai", atau specific model)
+            max_tokens: Maximum tokens to generate
+            temperature: Generation temperature
+            system_prompt: Instruksi statis yang dikirim sebagai system message
+
+        Yields:
+            str: Potongan text sesuai urutan dari provider
+        """
+        provider_name, model_name = self._parse_model_choice(model)
+
+        if provider_name not in self.providers:
+            raise ValueError(f"Provider {provider_name} not available")
+
+        async for chunk in self.providers[provider_name].generate_text_stream(
+            prompt=prompt,
+            model=model_name,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system_prompt=system_prompt,
+            **kwargs
+        ):
+            yield chunk
+
     async def generate_embedding(self, text: str, provider: str = "gemini") -> List[float]:
         """
         Generate embedding untuk text
@@ -301,6 +428,16 @@ class LLMService:
         """Check if provider is available"""
         return provider in self.providers
 
+    async def aclose(self):
+        """Release client resources milik semua providers"""
+        results = await asyncio.gather(
+            *(provider.aclose() for provider in self.providers.values()),
+            return_exceptions=True
+        )
+        for provider_name, result in zip(self.providers, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close provider {provider_name}: {str(result)}")
+
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all providers"""
         health_status = {}
@@ -466,7 +466,7 @@ class RAGProcessingService:
 
         return {
             "session_id": session_id,
-            "status": session.status.value,
+            "status": session.status_value,
             "current_step": session.current_step,
             "progress_percentage": session.progress_percentage,
             "is_processing": is_processing,
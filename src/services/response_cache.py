@@ -0,0 +1,170 @@
+"""
+Response Cache
+==============
+
+Cache dua lapis untuk hasil generasi LLM (CP/ATP):
+
+- L1 exact-match, key sha256(model + prompt); disimpan in-process dan di Redis
+  jika tersedia sehingga bisa dipakai bersama antar worker.
+- L2 semantic, embedding topik/sub topik dibandingkan (cosine) hanya
+  dengan entry ber-scope sama (doc_type, mata pelajaran, kelas, fase,
+  model; untuk ATP juga alokasi waktu dan hash CP), agar kelas, fase,
+  atau CP yang berbeda tidak pernah tertukar.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from redis import asyncio as redis_asyncio
+
+from config import envs
+from .llm_service import LLMService
+from ..utils.logger import get_logger
+
+logger = get_logger("ResponseCache")
+
+KEY_PREFIX = "llm_response:"
+
+class ResponseCache:
+    """Cache exact-match + semantic untuk response LLM"""
+
+    def __init__(self, llm_service: LLMService, max_entries: int = 512):
+        self.llm_service = llm_service
+        self.enabled = envs.LLM_CACHE_ENABLED
+        self.ttl = envs.LLM_CACHE_TTL
+        self.threshold = envs.LLM_CACHE_SIMILARITY
+        self.max_entries = max_entries
+
+        self._exact: "OrderedDict[str, str]" = OrderedDict()
+        # scope -> {topic: (unit embedding, response)}; set() untuk topic yang
+        # sama menggantikan entry lama (mis. hasil regenerate)
+        self._semantic: Dict[str, "OrderedDict[str, Tuple[np.ndarray, str]]"] = {}
+        self._embeddings: "OrderedDict[str, Optional[np.ndarray]]" = OrderedDict()
+        self._redis: Optional[redis_asyncio.Redis] = None
+        self._redis_checked = False
+
+        self.hits = {"exact": 0, "semantic": 0}
+        self.misses = 0
+
+    async def get(self, prompt: str, scope: str, topic: str) -> Optional[str]:
+        """Cari response untuk prompt; None jika miss"""
+        if not self.enabled:
+            return None
+
+        key = self._prompt_key(prompt)
+        response = self._exact.get(key)
+        if response is None:
+            redis_client = await self._get_redis()
+            if redis_client is not None:
+                try:
+                    value = await redis_client.get(KEY_PREFIX + key)
+                except Exception as e:
+                    logger.warning(f"Redis cache lookup failed: {str(e)}")
+                    value = None
+                if value is not None:
+                    response = value.decode()
+                    self._remember_exact(key, response)
+
+        if response is not None:
+            self._exact.move_to_end(key)
+            self.hits["exact"] += 1
+            return response
+
+        candidates = self._semantic.get(scope)
+        if candidates:
+            vector = await self._embed(topic)
+            if vector is not None:
+                best_score, best_response = max(
+                    ((float(np.dot(vector, candidate)), cached) for candidate, cached in candidates.values()),
+                    key=lambda item: item[0]
+                )
+                if best_score >= self.threshold:
+                    logger.debug(f"Semantic cache hit ({best_score:.3f}) for scope {scope}")
+                    self.hits["semantic"] += 1
+                    return best_response
+
+        self.misses += 1
+        return None
+
+    async def set(self, prompt: str, scope: str, topic: str, response: str):
+        """Simpan response ke kedua lapis cache"""
+        if not self.enabled or not response:
+            return
+
+        key = self._prompt_key(prompt)
+        self._remember_exact(key, response)
+
+        redis_client = await self._get_redis()
+        if redis_client is not None:
+            try:
+                await redis_client.set(KEY_PREFIX + key, response.encode(), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {str(e)}")
+
+        vector = await self._embed(topic)
+        if vector is not None:
+            entries = self._semantic.setdefault(scope, OrderedDict())
+            entries.pop(topic, None)
+            entries[topic] = (vector, response)
+            if len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Statistik hit/miss cache"""
+        return {
+            "exact_hits": self.hits["exact"],
+            "semantic_hits": self.hits["semantic"],
+            "misses": self.misses,
+            "exact_entries": len(self._exact),
+            "semantic_scopes": len(self._semantic)
+        }
+
+    async def aclose(self):
+        """Tutup koneksi Redis"""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode()).hexdigest()
+
+    def _remember_exact(self, key: str, response: str):
+        self._exact[key] = response
+        if len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+    async def _get_redis(self) -> Optional[redis_asyncio.Redis]:
+        """Connect ke Redis sekali; jika gagal cache hanya in-process"""
+        if not self._redis_checked:
+            self._redis_checked = True
+            client = redis_asyncio.from_url(envs.REDIS_URL, password=envs.REDIS_PASSWORD,
+                                            socket_timeout=envs.REDIS_SOCKET_TIMEOUT)
+            try:
+                await client.ping()
+                self._redis = client
+            except Exception as e:
+                logger.warning(f"Redis unavailable, response cache is in-process only: {str(e)}")
+                await client.aclose()
+        return self._redis
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embedding ter-normalisasi untuk text, di-cache per text"""
+        if text in self._embeddings:
+            self._embeddings.move_to_end(text)
+            return self._embeddings[text]
+
+        try:
+            vector = np.asarray(await self.llm_service.generate_embedding(text), dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            vector = vector / norm if norm else None
+        except Exception as e:
+            logger.warning(f"Embedding for semantic cache failed: {str(e)}")
+            vector = None
+
+        self._embeddings[text] = vector
+        if len(self._embeddings) > self.max_entries:
+            self._embeddings.popitem(last=False)
+        return vector
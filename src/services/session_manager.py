@@ -51,6 +51,36 @@ class SessionState:
         # WebSocket connection
         self.websocket_connection = None
 
+    # Status dan timestamp di-serialize di setiap response/broadcast, sehingga
+    # nilai string-nya di-cache dan hanya dihitung ulang saat atribut berubah
+
+    @property
+    def status(self) -> SessionStatusEnum:
+        return self._status
+
+    @status.setter
+    def status(self, status: SessionStatusEnum):
+        self._status = status
+        self.status_value: str = status.value
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = value
+        self.created_at_iso: str = value.isoformat()
+
+    @property
+    def updated_at(self) -> datetime:
+        return self._updated_at
+
+    @updated_at.setter
+    def updated_at(self, value: datetime):
+        self._updated_at = value
+        self.updated_at_iso: str = value.isoformat()
+
     def update_status(self, status: SessionStatusEnum, step: str = "", progress: float = 0.0):
         """Update session status"""
         self.status = status
@@ -75,9 +105,9 @@ class SessionState:
         return {
             "session_id": self.session_id,
             "user_id": self.user_id,
-            "status": self.status.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "status": self.status_value,
+            "created_at": self.created_at_iso,
+            "updated_at": self.updated_at_iso,
             "current_step": self.current_step,
             "progress_percentage": self.progress_percentage,
             "validation_count": len(self.validation_history),
@@ -247,19 +277,8 @@ class SessionManager:
         if not session:
             return False
 
-        # Convert API model to core model
-        session.user_input = UserInput(
-            nama_guru=user_input.nama_guru,
-            nama_sekolah=user_input.nama_sekolah,
-            mata_pelajaran=user_input.mata_pelajaran,
-            topik=user_input.topik,
-            sub_topik=user_input.sub_topik,
-            kelas=user_input.kelas,
-            alokasi_waktu=user_input.alokasi_waktu,
-            model_llm=user_input.model_llm,
-            cp=user_input.cp,
-            atp=user_input.atp
-        )
+        # Convert API model to core model; field UserInputRequest sama persis dengan UserInput
+        session.user_input = UserInput(**user_input.model_dump())
 
         session.update_status(SessionStatusEnum.INPUT_COLLECTION, "User input received", 10.0)
 
@@ -386,7 +405,7 @@ class SessionManager:
             current_step=session.current_step,
             progress_percentage=session.progress_percentage,
             estimated_remaining_time=estimated_remaining,
-            last_updated=session.updated_at.isoformat()
+            last_updated=session.updated_at_iso
         )
 
     def get_system_stats(self) -> Dict[str, Any]:
@@ -12,7 +12,7 @@ Updated: Sesuai dengan instruksi Orchestrated RAG terbaru
 
 import asyncio
 import os
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
 import json
 import hashlib
@@ -169,40 +169,78 @@ class VectorDBService:
         Returns:
             List[Dict]: Hasil pencarian
         """
-        try:
-            if doc_type not in self.collections:
-                logger.warning(f"Collection for {doc_type} not found")
-                return []
+        results = await self.search_documents_batch(
+            [(query, doc_type)], top_k=top_k, strategy=strategy, filters=filters
+        )
+        return results[doc_type]
 
-            collection = self.collections[doc_type]
+    async def search_documents_batch(
+        self,
+        queries: List[Tuple[str, str]],
+        top_k: int = 5,
+        strategy: RAGStrategy = RAGStrategy.SIMPLE,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search beberapa (query, doc_type) sekaligus
 
-            # Generate query embedding
-            if self.llm_service:
-                query_embedding = await self.llm_service.generate_embedding(query)
-            else:
-                logger.warning("LLM service not available for search")
-                return []
-
-            # Prepare search parameters based on strategy
-            search_params = self._prepare_search_params(strategy, top_k, filters)
-
-            # Perform search
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=search_params["n_results"],
-                where=search_params.get("where"),
-                include=["documents", "metadatas", "distances"]
-            )
+        Query string yang sama hanya di-embed sekali dan embedding untuk
+        query berbeda di-generate paralel; tiap doc_type tetap di-query ke
+        collection-nya masing-masing.
 
-            # Process results
-            processed_results = self._process_search_results(results, strategy)
+        Args:
+            queries: List (query, doc_type); doc_type harus unik
+            top_k: Jumlah hasil teratas per doc_type
+            strategy: RAG strategy yang digunakan
+            filters: Filter metadata (optional)
 
-            logger.debug(f"Found {len(processed_results)} documents for query in {doc_type}")
-            return processed_results
+        Returns:
+            Dict[str, List[Dict]]: Hasil pencarian per doc_type
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {doc_type: [] for _, doc_type in queries}
 
+        for _, doc_type in queries:
+            if doc_type not in self.collections:
+                logger.warning(f"Collection for {doc_type} not found")
+        queries = [(query, doc_type) for query, doc_type in queries if doc_type in self.collections]
+        if not queries:
+            return results
+
+        if not self.llm_service:
+            logger.warning("LLM service not available for search")
+            return results
+
+        try:
+            # Generate query embeddings (sekali per query string unik)
+            unique_queries = list(dict.fromkeys(query for query, _ in queries))
+            embeddings = dict(zip(unique_queries, await asyncio.gather(
+                *(self.llm_service.generate_embedding(query) for query in unique_queries)
+            )))
         except Exception as e:
             logger.error(f"Error searching documents: {str(e)}")
-            return []
+            return results
+
+        # Prepare search parameters based on strategy
+        search_params = self._prepare_search_params(strategy, top_k, filters)
+
+        for query, doc_type in queries:
+            try:
+                # Perform search
+                raw_results = self.collections[doc_type].query(
+                    query_embeddings=[embeddings[query]],
+                    n_results=search_params["n_results"],
+                    where=search_params.get("where"),
+                    include=["documents", "metadatas", "distances"]
+                )
+
+                # Process results
+                results[doc_type] = self._process_search_results(raw_results, strategy)
+                logger.debug(f"Found {len(results[doc_type])} documents for query in {doc_type}")
+
+            except Exception as e:
+                logger.error(f"Error searching documents in {doc_type}: {str(e)}")
+
+        return results
 
     def _prepare_search_params(
         self,
@@ -6,7 +6,6 @@ Database configuration untuk RAG Multi-Strategy Backend
 Mendukung MySQL, MongoDB, dan Redis
 """
 
-import os
 from pathlib import Path
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
@@ -17,6 +16,7 @@ import pymongo
 from typing import Optional, Dict, Any
 
 from ..utils.logger import get_logger
+from config import envs
 
 logger = get_logger("DatabaseConfig")
 
@@ -28,23 +28,22 @@ class DatabaseConfig:
 
     def __init__(self):
         # MySQL Configuration
-        self.mysql_host = os.getenv("MYSQL_HOST", "if.unismuh.ac.id")
-        self.mysql_port = int(os.getenv("MYSQL_PORT", "3388"))
-        self.mysql_user = os.getenv("MYSQL_USER", "root")
-        self.mysql_password = os.getenv("MYSQL_PASSWORD", "mariabelajar")
-        self.mysql_database = os.getenv("MYSQL_DATABASE", "rag_multi_strategy")
+        self.mysql_host = envs.MYSQL_HOST
+        self.mysql_port = envs.MYSQL_PORT
+        self.mysql_user = envs.MYSQL_USER
+        self.mysql_password = envs.MYSQL_PASSWORD
+        self.mysql_database = envs.MYSQL_DATABASE
 
         # MongoDB Configuration
-        self.mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
-        self.mongodb_database = os.getenv("MONGODB_DATABASE", "rag_multi_strategy")
+        self.mongodb_url = envs.MONGODB_URL
+        self.mongodb_database = envs.MONGODB_DATABASE
 
         # SQLAlchemy URL
-        self.database_url = os.getenv(
-            "DATABASE_URL",
+        self.database_url = envs.DATABASE_URL or (
             f"mysql+pymysql://{self.mysql_user}:{self.mysql_password}@{self.mysql_host}:{self.mysql_port}/{self.mysql_database}"
         )
-        self.database_echo = os.getenv("DATABASE_ECHO", "false").lower() == "true"
-        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.database_echo = envs.DATABASE_ECHO
+        self.redis_url = envs.REDIS_URL
 
         # Ensure data directory exists
         data_dir = Path("./data")
@@ -82,10 +81,10 @@ class DatabaseConfig:
                 self._engine = create_engine(
                     self.database_url,
                     echo=self.database_echo,
-                    pool_size=int(os.getenv("DATABASE_POOL_SIZE", "20")),
-                    max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "30")),
-                    pool_timeout=30,
-                    pool_recycle=3600,
+                    pool_size=envs.DATABASE_POOL_SIZE,
+                    max_overflow=envs.DATABASE_MAX_OVERFLOW,
+                    pool_timeout=envs.DATABASE_POOL_TIMEOUT,
+                    pool_recycle=envs.DATABASE_POOL_RECYCLE,
                     pool_pre_ping=True,
                     connect_args={
                         "charset": "utf8mb4",
@@ -99,10 +98,11 @@ class DatabaseConfig:
                 self._engine = create_engine(
                     self.database_url,
                     echo=self.database_echo,
-                    pool_size=int(os.getenv("DATABASE_POOL_SIZE", "20")),
-                    max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "30")),
-                    pool_timeout=30,
-                    pool_recycle=3600
+                    pool_size=envs.DATABASE_POOL_SIZE,
+                    max_overflow=envs.DATABASE_MAX_OVERFLOW,
+                    pool_timeout=envs.DATABASE_POOL_TIMEOUT,
+                    pool_recycle=envs.DATABASE_POOL_RECYCLE,
+                    pool_pre_ping=True
                 )
 
             logger.info(f"Database engine created: {type(self._engine.dialect).__name__}")
@@ -154,9 +154,9 @@ class DatabaseConfig:
             try:
                 self._redis_client = redis.from_url(
                     self.redis_url,
-                    password=os.getenv("REDIS_PASSWORD", None),
-                    socket_timeout=int(os.getenv("REDIS_SOCKET_TIMEOUT", "5")),
-                    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+                    password=envs.REDIS_PASSWORD,
+                    socket_timeout=envs.REDIS_SOCKET_TIMEOUT,
+                    max_connections=envs.REDIS_MAX_CONNECTIONS,
                     decode_responses=True
                 )
 
@@ -0,0 +1,26 @@
+"""
+Event Loop Utilities
+====================
+
+Menjalankan coroutine entry point dengan uvloop jika tersedia
+(Linux/macOS), dengan fallback ke event loop asyncio default.
+Juga menyediakan pilihan loop yang sama untuk server uvicorn.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:  # uvloop tidak tersedia di Windows
+    uvloop = None
+
+# Nilai parameter `loop` untuk uvicorn.run
+UVICORN_LOOP = "uvloop" if uvloop is not None else "asyncio"
+
+
+def run(main: Coroutine[Any, Any, Any]) -> Any:
+    """Run coroutine sampai selesai, memakai uvloop jika terinstall"""
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
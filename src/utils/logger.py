@@ -1,6 +1,9 @@
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from rich.logging import RichHandler
 from rich.console import Console
@@ -8,7 +11,7 @@ from rich.traceback import install
 from rich.theme import Theme
 from rich.text import Text
 from rich.panel import Panel
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 # Install rich traceback
 install()
@@ -36,19 +39,17 @@ class CustomFormatter(logging.Formatter):
         timestamp = datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
         return f"[{timestamp}] [{record.levelname}] [{record.name}] {record.getMessage()}"
 
-class Logger:
-    def __init__(self, name: str = "RAG_Multi_Strategy"):
-        self.logger = logging.getLogger(name)
-        self.console = console
-        self._setup_logger()
-
-    def _setup_logger(self):
-        """Setup logger with both file and rich console handlers"""
-        self.logger.setLevel(logging.DEBUG)
-
-        # Clear existing handlers
-        self.logger.handlers.clear()
-
+# File logging lewat queue: record di-enqueue dari event loop, ditulis ke disk
+# oleh thread QueueListener. Console (rich) tetap sinkron agar urutan output
+# sama dengan console.print di bawah.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler: Optional[QueueHandler] = None
+_rich_handler: Optional[RichHandler] = None
+
+def _get_handlers():
+    """Buat handler bersama sekali per process (file via queue + rich console)"""
+    global _queue_handler, _rich_handler
+    if _queue_handler is None:
         # Create logs directory if it doesn't exist
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
@@ -59,34 +60,56 @@ class Logger:
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(CustomFormatter())
 
+        listener = QueueListener(_log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+        _queue_handler = QueueHandler(_log_queue)
+        _queue_handler.setLevel(logging.DEBUG)
+
         # Rich console handler
-        rich_handler = RichHandler(
-            console=self.console,
+        _rich_handler = RichHandler(
+            console=console,
             show_time=True,
             show_path=False,
             rich_tracebacks=True,
             tracebacks_show_locals=True
         )
-        rich_handler.setLevel(logging.INFO)
+        _rich_handler.setLevel(logging.INFO)
+    return _queue_handler, _rich_handler
+
+class Logger:
+    def __init__(self, name: str = "RAG_Multi_Strategy"):
+        self.logger = logging.getLogger(name)
+        self.console = console
+        self._setup_logger()
+
+    def _setup_logger(self):
+        """Setup logger with both file and rich console handlers"""
+        self.logger.setLevel(logging.DEBUG)
+
+        # Clear existing handlers
+        self.logger.handlers.clear()
 
-        self.logger.addHandler(file_handler)
+        queue_handler, rich_handler = _get_handlers()
+        self.logger.addHandler(queue_handler)
         self.logger.addHandler(rich_handler)
 
-    def info(self, message: str, extra: Dict[str, Any] = None):
-        """Log info message"""
-        self.logger.info(message, extra=extra)
+    def info(self, message: str, *args: Any, extra: Dict[str, Any] = None):
+        """Log info message (args di-format lazily dengan %-style)"""
+        self.logger.info(message, *args, extra=extra)
 
-    def warning(self, message: str, extra: Dict[str, Any] = None):
-        """Log warning message"""
-        self.logger.warning(message, extra=extra)
+    def warning(self, message: str, *args: Any, extra: Dict[str, Any] = None):
+        """Log warning message (args di-format lazily dengan %-style)"""
+        self.logger.warning(message, *args, extra=extra)
 
-    def error(self, message: str, extra: Dict[str, Any] = None):
-        """Log error message"""
-        self.logger.error(message, extra=extra)
+    def error(self, message: str, *args: Any, extra: Dict[str, Any] = None):
+        """Log error message (args di-format lazily dengan %-style)"""
+        self.logger.error(message, *args, extra=extra)
 
-    def debug(self, message: str, extra: Dict[str, Any] = None):
-        """Log debug message"""
-        self.logger.debug(message, extra=extra)
+    def debug(self, message: str, *args: Any, extra: Dict[str, Any] = None):
+        """Log debug message (args di-format lazily dengan %-style)"""
+        self.logger.debug(message, *args, extra=extra)
 
     def critical(self, message: str, extra: Dict[str, Any] = None):
         """Log critical message"""
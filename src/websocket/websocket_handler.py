@@ -6,16 +6,25 @@ WebSocket handler untuk real-time user-system interaction
 Menangani connection management dan message routing
 """
 
-import json
 import asyncio
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
+
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
 from ..utils.logger import get_logger
 
 logger = get_logger("WebSocketHandler")
 
+def encode_frame(payload: Dict[str, Any]) -> bytes:
+    """Encode payload ke JSON bytes (orjson) untuk dikirim sebagai binary frame"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
+async def send_frame(websocket: WebSocket, payload: Dict[str, Any]):
+    """Send payload sebagai JSON binary frame"""
+    await websocket.send_bytes(encode_frame(payload))
+
 class WebSocketManager:
     """
     Manager untuk WebSocket connections dan broadcasting
@@ -113,12 +122,12 @@ class WebSocketManager:
             logger.warning(f"No connections found for session: {session_id}")
             return
 
-        message_json = json.dumps(message)
+        frame = encode_frame(message)
         connections = self.connections[session_id].copy()
 
         for websocket in connections:
             try:
-                await websocket.send_text(message_json)
+                await websocket.send_bytes(frame)
             except Exception as e:
                 logger.warning(f"Failed to send message to WebSocket: {str(e)}")
                 # Remove dead connection
@@ -131,12 +140,12 @@ class WebSocketManager:
         Args:
             message: Message to broadcast
         """
-        message_json = json.dumps(message)
+        frame = encode_frame(message)
 
         for session_id, connections in self.connections.items():
             for websocket in connections.copy():
                 try:
-                    await websocket.send_text(message_json)
+                    await websocket.send_bytes(frame)
                 except Exception as e:
                     logger.warning(f"Failed to broadcast to session {session_id}: {str(e)}")
                     await self.disconnect(websocket, session_id)
@@ -175,31 +184,31 @@ class WebSocketManager:
 
     async def handle_ping(self, websocket: WebSocket):
         """Handle ping message"""
-        await websocket.send_text(json.dumps({
+        await send_frame(websocket, {
             "type": "pong",
             "timestamp": datetime.now().isoformat()
-        }))
+        })
 
     async def handle_get_connection_info(self, session_id: str, websocket: WebSocket):
         """Handle get connection info request"""
         connection_count = len(self.connections.get(session_id, []))
 
-        await websocket.send_text(json.dumps({
+        await send_frame(websocket, {
             "type": "connection_info",
             "session_id": session_id,
             "connection_count": connection_count,
             "connection_id": id(websocket),
             "timestamp": datetime.now().isoformat()
-        }))
+        })
 
     async def send_error(self, websocket: WebSocket, error_message: str):
         """Send error message via WebSocket"""
         try:
-            await websocket.send_text(json.dumps({
+            await send_frame(websocket, {
                 "type": "error",
                 "error_message": error_message,
                 "timestamp": datetime.now().isoformat()
-            }))
+            })
         except Exception as e:
             logger.error(f"Failed to send error message: {str(e)}")
 
@@ -276,8 +285,8 @@ class WebSocketHandler:
 
                     # Parse JSON
                     try:
-                        message_data = json.loads(data)
-                    except json.JSONDecodeError as e:
+                        message_data = orjson.loads(data)
+                    except orjson.JSONDecodeError as e:
                         await self.manager.send_error(websocket, f"Invalid JSON: {str(e)}")
                         continue
 
@@ -303,22 +312,22 @@ class WebSocketHandler:
 async def handle_status_request(session_id: str, websocket: WebSocket, message_data: Dict[str, Any]):
     """Handle status request message"""
     # This will be implemented to integrate with processing service
-    await websocket.send_text(json.dumps({
+    await send_frame(websocket, {
         "type": "status_response",
         "session_id": session_id,
         "status": "handler_not_implemented",
         "timestamp": datetime.now().isoformat()
-    }))
+    })
 
 async def handle_cancel_request(session_id: str, websocket: WebSocket, message_data: Dict[str, Any]):
     """Handle cancel processing request"""
     # This will be implemented to integrate with processing service
-    await websocket.send_text(json.dumps({
+    await send_frame(websocket, {
         "type": "cancel_response",
         "session_id": session_id,
         "result": "handler_not_implemented",
         "timestamp": datetime.now().isoformat()
-    }))
+    })
 
 # Global WebSocket manager instance
 websocket_manager = WebSocketManager()
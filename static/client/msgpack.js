@@ -0,0 +1,208 @@
+/*
+ * MessagePack codec minimal untuk client WebSocket (subprotocol "msgpack").
+ *
+ * Disajikan dari server bersama index.html sehingga client tidak bergantung
+ * pada script CDN. API mengikuti @msgpack/msgpack yang dipakai sebelumnya:
+ * MessagePack.encode(value) -> Uint8Array, MessagePack.decode(bytes) -> value.
+ * Extension timestamp (-1), yang dipakai msgspec untuk datetime, di-decode
+ * menjadi Date.
+ */
+(function (global) {
+    'use strict';
+
+    const textEncoder = new TextEncoder();
+    const textDecoder = new TextDecoder();
+    const TIMESTAMP_EXT = -1;
+
+    // === Decode ===
+
+    function decode(bytes) {
+        const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+        let pos = 0;
+
+        function readBytes(length) {
+            const out = bytes.subarray(pos, pos + length);
+            pos += length;
+            return out;
+        }
+
+        function readStr(length) {
+            return textDecoder.decode(readBytes(length));
+        }
+
+        function readArray(length) {
+            const out = new Array(length);
+            for (let i = 0; i < length; i++) {
+                out[i] = read();
+            }
+            return out;
+        }
+
+        function readMap(length) {
+            const out = {};
+            for (let i = 0; i < length; i++) {
+                const key = read();
+                out[key] = read();
+            }
+            return out;
+        }
+
+        function readExt(length) {
+            const type = view.getInt8(pos);
+            pos += 1;
+            if (type === TIMESTAMP_EXT) {
+                return readTimestamp(length);
+            }
+            return { type: type, data: readBytes(length) };
+        }
+
+        function readTimestamp(length) {
+            let sec;
+            let nsec = 0;
+            if (length === 4) {
+                sec = view.getUint32(pos);
+            } else if (length === 8) {
+                const high = view.getUint32(pos);
+                nsec = high >>> 2;
+                sec = (high & 0x3) * 0x100000000 + view.getUint32(pos + 4);
+            } else if (length === 12) {
+                nsec = view.getUint32(pos);
+                sec = Number(view.getBigInt64(pos + 4));
+            } else {
+                throw new Error(`Invalid msgpack timestamp length: ${length}`);
+            }
+            pos += length;
+            return new Date(sec * 1000 + nsec / 1e6);
+        }
+
+        function read() {
+            const byte = view.getUint8(pos);
+            pos += 1;
+
+            if (byte <= 0x7f) return byte;
+            if (byte >= 0xe0) return byte - 0x100;
+            if (byte >= 0xa0 && byte <= 0xbf) return readStr(byte & 0x1f);
+            if (byte >= 0x90 && byte <= 0x9f) return readArray(byte & 0x0f);
+            if (byte >= 0x80 && byte <= 0x8f) return readMap(byte & 0x0f);
+
+            let value;
+            switch (byte) {
+                case 0xc0: return null;
+                case 0xc2: return false;
+                case 0xc3: return true;
+                case 0xc4: value = view.getUint8(pos); pos += 1; return readBytes(value).slice();
+                case 0xc5: value = view.getUint16(pos); pos += 2; return readBytes(value).slice();
+                case 0xc6: value = view.getUint32(pos); pos += 4; return readBytes(value).slice();
+                case 0xc7: value = view.getUint8(pos); pos += 1; return readExt(value);
+                case 0xc8: value = view.getUint16(pos); pos += 2; return readExt(value);
+                case 0xc9: value = view.getUint32(pos); pos += 4; return readExt(value);
+                case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+                case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+                case 0xcc: value = view.getUint8(pos); pos += 1; return value;
+                case 0xcd: value = view.getUint16(pos); pos += 2; return value;
+                case 0xce: value = view.getUint32(pos); pos += 4; return value;
+                case 0xcf: value = Number(view.getBigUint64(pos)); pos += 8; return value;
+                case 0xd0: value = view.getInt8(pos); pos += 1; return value;
+                case 0xd1: value = view.getInt16(pos); pos += 2; return value;
+                case 0xd2: value = view.getInt32(pos); pos += 4; return value;
+                case 0xd3: value = Number(view.getBigInt64(pos)); pos += 8; return value;
+                case 0xd4: return readExt(1);
+                case 0xd5: return readExt(2);
+                case 0xd6: return readExt(4);
+                case 0xd7: return readExt(8);
+                case 0xd8: return readExt(16);
+                case 0xd9: value = view.getUint8(pos); pos += 1; return readStr(value);
+                case 0xda: value = view.getUint16(pos); pos += 2; return readStr(value);
+                case 0xdb: value = view.getUint32(pos); pos += 4; return readStr(value);
+                case 0xdc: value = view.getUint16(pos); pos += 2; return readArray(value);
+                case 0xdd: value = view.getUint32(pos); pos += 4; return readArray(value);
+                case 0xde: value = view.getUint16(pos); pos += 2; return readMap(value);
+                case 0xdf: value = view.getUint32(pos); pos += 4; return readMap(value);
+            }
+            throw new Error(`Unsupported msgpack type byte: 0x${byte.toString(16)}`);
+        }
+
+        return read();
+    }
+
+    // === Encode ===
+
+    function encode(value) {
+        let buffer = new Uint8Array(256);
+        let view = new DataView(buffer.buffer);
+        let pos = 0;
+
+        function ensure(extra) {
+            if (pos + extra <= buffer.length) return;
+            let size = buffer.length * 2;
+            while (size < pos + extra) size *= 2;
+            const grown = new Uint8Array(size);
+            grown.set(buffer.subarray(0, pos));
+            buffer = grown;
+            view = new DataView(buffer.buffer);
+        }
+
+        function writeHeader(length, fixBase, fixMax, code8, code16, code32) {
+            if (fixBase !== null && length <= fixMax) {
+                ensure(1); view.setUint8(pos, fixBase | length); pos += 1;
+            } else if (code8 !== null && length <= 0xff) {
+                ensure(2); view.setUint8(pos, code8); view.setUint8(pos + 1, length); pos += 2;
+            } else if (length <= 0xffff) {
+                ensure(3); view.setUint8(pos, code16); view.setUint16(pos + 1, length); pos += 3;
+            } else {
+                ensure(5); view.setUint8(pos, code32); view.setUint32(pos + 1, length); pos += 5;
+            }
+        }
+
+        function writeRaw(bytes) {
+            ensure(bytes.length);
+            buffer.set(bytes, pos);
+            pos += bytes.length;
+        }
+
+        function writeNumber(num) {
+            if (Number.isSafeInteger(num)) {
+                if (num >= 0 && num <= 0x7f) { ensure(1); view.setUint8(pos, num); pos += 1; return; }
+                if (num < 0 && num >= -0x20) { ensure(1); view.setInt8(pos, num); pos += 1; return; }
+                if (num >= 0 && num <= 0xffffffff) { ensure(5); view.setUint8(pos, 0xce); view.setUint32(pos + 1, num); pos += 5; return; }
+                if (num >= -0x80000000 && num < 0) { ensure(5); view.setUint8(pos, 0xd2); view.setInt32(pos + 1, num); pos += 5; return; }
+                ensure(9); view.setUint8(pos, 0xd3); view.setBigInt64(pos + 1, BigInt(num)); pos += 9; return;
+            }
+            ensure(9); view.setUint8(pos, 0xcb); view.setFloat64(pos + 1, num); pos += 9;
+        }
+
+        function write(v) {
+            if (v === null || v === undefined) { ensure(1); view.setUint8(pos, 0xc0); pos += 1; return; }
+            if (v === true || v === false) { ensure(1); view.setUint8(pos, v ? 0xc3 : 0xc2); pos += 1; return; }
+            if (typeof v === 'number') { writeNumber(v); return; }
+            if (typeof v === 'string') {
+                const bytes = textEncoder.encode(v);
+                writeHeader(bytes.length, 0xa0, 0x1f, 0xd9, 0xda, 0xdb);
+                writeRaw(bytes);
+                return;
+            }
+            if (v instanceof Uint8Array) {
+                writeHeader(v.length, null, 0, 0xc4, 0xc5, 0xc6);
+                writeRaw(v);
+                return;
+            }
+            if (Array.isArray(v)) {
+                writeHeader(v.length, 0x90, 0x0f, null, 0xdc, 0xdd);
+                for (const item of v) write(item);
+                return;
+            }
+            if (v instanceof Date) { write(v.toISOString()); return; }
+            const keys = Object.keys(v).filter((key) => v[key] !== undefined);
+            writeHeader(keys.length, 0x80, 0x0f, null, 0xde, 0xdf);
+            for (const key of keys) {
+                write(key);
+                write(v[key]);
+            }
+        }
+
+        write(value);
+        return buffer.slice(0, pos);
+    }
+
+    global.MessagePack = { encode: encode, decode: decode };
+})(typeof window !== 'undefined' ? window : globalThis);
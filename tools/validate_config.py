@@ -0,0 +1,61 @@
+"""
+Config Validation Script
+========================
+
+Validasi statis untuk thresholds dan weights orchestrator.
+Dijalankan saat pre-commit sehingga tidak perlu diulang setiap startup.
+
+Usage:
+    python -m tools.validate_config
+"""
+
+import math
+import sys
+
+from config.config import get_config
+
+WEIGHT_SUM_TOLERANCE = 1e-6
+
+
+def validate_thresholds(thresholds) -> list:
+    """Semua threshold harus berada di rentang [0.0, 1.0]"""
+    errors = []
+    for name, value in thresholds._asdict().items():
+        if not 0.0 <= value <= 1.0:
+            errors.append(f"Threshold '{name}' out of range [0.0, 1.0]: {value}")
+    return errors
+
+
+def validate_weights(weights) -> list:
+    """Setiap weight di rentang [0.0, 1.0] dan total per group ~1.0"""
+    errors = []
+    for group, group_weights in weights._asdict().items():
+        for name, value in group_weights._asdict().items():
+            if not 0.0 <= value <= 1.0:
+                errors.append(f"Weight '{group}.{name}' out of range [0.0, 1.0]: {value}")
+
+        total = sum(group_weights)
+        if not math.isclose(total, 1.0, abs_tol=WEIGHT_SUM_TOLERANCE):
+            errors.append(f"Weights in '{group}' must sum to 1.0, got {total}")
+    return errors
+
+
+def main() -> int:
+    """Main function"""
+    config = get_config()
+
+    errors = validate_thresholds(config.orchestrator_thresholds)
+    errors += validate_weights(config.orchestrator_weights)
+
+    if errors:
+        print("❌ Invalid configuration:")
+        for error in errors:
+            print(f"  - {error}")
+        return 1
+
+    print("✅ Configuration valid")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())